@@ -6,20 +6,33 @@ A comprehensive web application for analyzing DCS World missions with interactiv
 
 import os
 import json
-import subprocess
 import tempfile
 import shutil
 import uuid
+import gzip
 import hashlib
+import heapq
+import pickle
 import re
+import secrets
+import threading
+import time
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for
+from flask import Flask, Response, make_response, render_template, request, session, jsonify, send_file, send_from_directory, flash, redirect, url_for
+from flask_compress import Compress
 from werkzeug.utils import secure_filename
-import plotly.graph_objects as go
-import plotly.utils
-from plotly.subplots import make_subplots
-import pandas as pd
+from markupsafe import Markup
+import orjson
+import brotli
 import logging
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter, itemgetter
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from itertools import chain, islice
+from dcs_xml_extractor import extract_xml
+from dcs_mission_analyzer import analyze_mission
 
 app = Flask(__name__)
 # Use environment variable for secret key in production, fallback for development
@@ -29,6 +42,20 @@ app.secret_key = os.environ.get('SECRET_KEY', 'dcs_mission_debrief_secret_key_20
 max_file_size = int(os.environ.get('MAX_UPLOAD_SIZE', 100)) * 1024 * 1024  # Default 100MB
 app.config['MAX_CONTENT_LENGTH'] = max_file_size
 
+# Compress HTML/JSON responses; the dashboard page embeds several MB of chart JSON.
+# Brotli at a low level is much cheaper than gzip -6 for a similar ratio.
+app.config['COMPRESS_ALGORITHM'] = ['br', 'zstd', 'gzip']
+app.config['COMPRESS_BR_LEVEL'] = 4
+app.config['COMPRESS_ZSTD_LEVEL'] = 3
+app.config['COMPRESS_MIN_SIZE'] = 4096
+# Files streamed with send_file are compressed on the fly. Flask-Compress leaves gzip out
+# of its streaming defaults, so gzip-only clients would get them uncompressed; use the
+# same list as above. These endpoints answer conditional requests against the
+# encoding-suffixed ETag
+app.config['COMPRESS_ALGORITHM_STREAMING'] = ['br', 'zstd', 'gzip']
+app.config['COMPRESS_STREAMING_ENDPOINT_CONDITIONAL'] = ['static', 'get_mission_data', 'download_file']
+Compress(app)
+
 # Production error handling
 if not app.debug:
     logging.basicConfig(level=logging.INFO)
@@ -39,46 +66,336 @@ if not app.debug:
 UPLOAD_FOLDER = 'uploads'
 RESULTS_FOLDER = 'results'
 ALLOWED_EXTENSIONS = {'log'}
+STREAM_UPLOAD_KINDS = {'dcs_log', 'debrief_log'}
+STREAM_CHUNK_SIZE = 1024 * 1024  # Read raw upload bodies 1 MiB at a time
+# Streamed files never claimed by /upload (e.g. the page was closed) are deleted after this many seconds
+STREAM_UPLOAD_MAX_AGE = int(os.environ.get('STREAM_UPLOAD_MAX_AGE', 3600))
+IO_BUFFER_SIZE = 256 * 1024  # Buffer for log/JSON file I/O; the 8 KiB default is slow for multi-MB files
+API_CACHE_MAX_AGE = int(os.environ.get('API_CACHE_MAX_AGE', 60))  # Seconds clients may reuse mission data unvalidated
+DOWNLOAD_CACHE_MAX_AGE = int(os.environ.get('DOWNLOAD_CACHE_MAX_AGE', 300))  # Same, for downloaded result files
+# Downloadable result files: file type -> (file in the session directory, download name pattern)
+DOWNLOAD_FILES = {
+    'json': ('mission_stats.json', 'mission_stats_{}.json'),
+    'xml': ('unit_group_mapping.xml', 'unit_mapping_{}.xml'),
+}
 
 # Ensure directories exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(RESULTS_FOLDER, exist_ok=True)
 
+@dataclass
+class PerfCfg:
+    """Limits on how much data a single chart is allowed to carry"""
+    max_points_per_plot: int = 500
+    max_heatmap_rows: int = 8
+    enable_downsampling: bool = True
+    strategy: str = 'top_k'
+
+PERF_CFG = PerfCfg(
+    max_points_per_plot=int(os.environ.get('MAX_POINTS_PER_PLOT', 500)),
+    enable_downsampling=os.environ.get('ENABLE_DOWNSAMPLING', 'True').lower() == 'true'
+)
+
+# Weapon name patterns, checked in order. Designators (AIM/PGU/AGM) are
+# case-sensitive, descriptive words are not.
+WEAPON_CATEGORY_PATTERNS = [
+    ('Air-to-Air Missile', re.compile(r'AIM|(?i:missile)')),
+    ('Gun/Cannon', re.compile(r'PGU|(?i:gun|cannon)')),
+    ('Air-to-Ground', re.compile(r'AGM|(?i:bomb)')),
+]
+
+# Marker colour per weapon category (order defines the palette index)
+WEAPON_CATEGORY_COLORS = {
+    'Air-to-Air Missile': 'blue',
+    'Gun/Cannon': 'red',
+    'Air-to-Ground': 'green',
+    'Other': 'gray',
+}
+
+# Marker colour per coalition id (1 = Red, 2 = Blue)
+COALITION_COLORS = {1: 'red', 2: 'blue'}
+
+def classify_weapons(weapons):
+    """Return the weapon analysis category of each name in a pandas Index, as a numpy array"""
+    import numpy as np
+    matches = [np.asarray(weapons.str.contains(pattern), dtype=bool) for _, pattern in WEAPON_CATEGORY_PATTERNS]
+    return np.select(matches, [category for category, _ in WEAPON_CATEGORY_PATTERNS], default='Other')
+
+def downsample(items, key, cfg, limit=None):
+    """Keep at most ``limit`` items (default ``cfg.max_points_per_plot``), preserving input order"""
+    items = list(items)
+    limit = cfg.max_points_per_plot if limit is None else limit
+    if not cfg.enable_downsampling or len(items) <= limit:
+        return items
+    if cfg.strategy != 'top_k':
+        raise ValueError(f"Unknown downsampling strategy: {cfg.strategy}")
+    keep = set(sorted(range(len(items)), key=lambda i: key(items[i]), reverse=True)[:limit])
+    return [item for i, item in enumerate(items) if i in keep]
+
+# Matches file names ending in one of the allowed extensions, in any letter case
+ALLOWED_FILE_RE = re.compile(r'\.(?:%s)\Z' % '|'.join(map(re.escape, ALLOWED_EXTENSIONS)), re.IGNORECASE)
+
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return ALLOWED_FILE_RE.search(filename) is not None
+
+# Background pool that runs uploaded-mission analyses outside the request
+_analysis_executor = None
+
+def _get_analysis_executor():
+    """Return the shared background analysis pool, creating it if needed"""
+    global _analysis_executor
+    if _analysis_executor is None:
+        _analysis_executor = ThreadPoolExecutor(max_workers=int(os.environ.get('ANALYSIS_WORKERS', 2)))
+    return _analysis_executor
+
+# Serialized figures that don't depend on mission data (empty states), built once per process
+_static_charts = {}
+
+def _static_chart(key, build):
+    """Return the JSON for a data-independent figure, building it with build() on first use"""
+    chart = _static_charts.get(key)
+    if chart is None:
+        chart = _static_charts[key] = _plotly_dumps(build())
+    return chart
+
+def _no_activity_chart(key, text, title, height):
+    """Return the JSON for a blank figure carrying a centred "no activity" message"""
+    return _static_chart(key, lambda: _figure_spec([], {
+        'annotations': [{'text': text, 'xref': "paper", 'yref': "paper",
+                         'x': 0.5, 'y': 0.5, 'xanchor': 'center', 'yanchor': 'middle',
+                         'showarrow': False, 'font': {'size': 16}}],
+        'title': {'text': title},
+        'xaxis': {'visible': False},
+        'yaxis': {'visible': False},
+        'height': height
+    }))
+
+# Pickled plain-dict make_subplots() grids, built once per process and copied per chart
+_subplot_specs = {}
+
+def _subplot_spec(name, **kwargs):
+    """Return a fresh (layout dict, cells) pair for a named make_subplots() grid"""
+    # cells maps (row, col) to the keys placing a raw trace dict in that cell
+    # (xaxis/yaxis, subplot or domain)
+    pickled = _subplot_specs.get(name)
+    if pickled is None:
+        from plotly.subplots import make_subplots
+        fig = make_subplots(**kwargs)
+        cells = {}
+        for row in range(1, kwargs.get('rows', 1) + 1):
+            for col in range(1, kwargs.get('cols', 1) + 1):
+                subplot = fig.get_subplot(row, col)
+                if subplot is None:
+                    continue
+                if hasattr(subplot, 'xaxis'):
+                    cells[row, col] = {'xaxis': subplot.xaxis.plotly_name.replace('axis', ''),
+                                       'yaxis': subplot.yaxis.plotly_name.replace('axis', '')}
+                elif hasattr(subplot, 'radialaxis'):
+                    cells[row, col] = {'subplot': subplot.plotly_name}
+                else:
+                    cells[row, col] = {'domain': {'x': list(subplot.x), 'y': list(subplot.y)}}
+        pickled = pickle.dumps((fig.layout.to_plotly_json(), cells))
+        _subplot_specs[name] = pickled
+    return pickle.loads(pickled)
+
+def _cell_axis(layout, cell, axis):
+    """Return the layout dict of a subplot cell's 'x' or 'y' axis"""
+    return layout[axis + 'axis' + cell[axis + 'axis'][1:]]
+
+# Default Plotly template as a plain dict, resolved once per process
+_default_template = None
+
+def _figure_spec(data, layout):
+    """Build a figure as a plain dict, bypassing graph_objects validation"""
+    global _default_template
+    if _default_template is None:
+        import plotly.io as pio
+        _default_template = pio.templates[pio.templates.default].to_plotly_json()
+    return {'data': data, 'layout': {'template': _default_template, **layout}}
+
+def _typed_array(values):
+    """Encode a numpy column as a plotly.js base64 typed array"""
+    # Raw dict figures skip the validators that normally do this
+    from _plotly_utils.utils import to_typed_array_spec
+    return to_typed_array_spec(values)
+
+def _plotly_dumps(fig):
+    """Serialize a figure (usually a raw dict spec) to a JSON string with plotly's orjson engine"""
+    # Raw dict figures are never validated, so validation stays off here too;
+    # numeric arrays must already be typed arrays (see _typed_array)
+    import plotly.io as pio
+    return pio.to_json(fig, validate=False, engine='orjson')
+
+def _load_json_file(path):
+    """Read a JSON file with a large buffer and parse it with orjson"""
+    with open(path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+        raw = f.read()
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # Files written by json.dump may contain NaN/Infinity, which orjson rejects
+        return json.loads(raw)
+
+SESSION_FILE = 'session_data.json'
+SESSION_CACHE_SIZE = int(os.environ.get('SESSION_CACHE_SIZE', 32))
+
+def _viz_filename(name):
+    """File holding one serialized visualization inside a session directory"""
+    return f'viz_{secure_filename(name)}.json'
+
+def _copy_file(src_path, dst_path):
+    """Give dst_path the contents of src_path, hardlinking when possible"""
+    # Renaming the result over dst_path replaces an existing file (possibly itself
+    # a link) instead of writing through it
+    tmp_path = f'{dst_path}.{uuid.uuid4().hex}.tmp'
+    try:
+        os.link(src_path, tmp_path)
+    except OSError:
+        with open(src_path, 'rb', buffering=IO_BUFFER_SIZE) as src, \
+             open(tmp_path, 'wb', buffering=IO_BUFFER_SIZE) as dst:
+            shutil.copyfileobj(src, dst, length=IO_BUFFER_SIZE)
+    os.replace(tmp_path, dst_path)
+
+def _write_atomic(path, data):
+    """Write bytes to a temporary file and rename it over path, so readers never see a partial file"""
+    # Concurrent writers of the same file each get their own temporary file
+    tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    with open(tmp_path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+# Precompressed copies stored beside each single figure, in order of preference:
+# (Content-Encoding, file suffix, compressor)
+PRECOMPRESSED_ENCODINGS = (
+    ('br', '.br', lambda data: brotli.compress(data, quality=5)),
+    ('gzip', '.gz', lambda data: gzip.compress(data, compresslevel=6)),
+)
+
+def _save_visualizations(session_dir, visualizations):
+    """Write each visualization to its own file and return the name -> file map"""
+    # Single figures are stored verbatim, with brotli and gzip copies, so they can
+    # be served straight from disk; chart lists are stored as a JSON array
+    files = {}
+    for name, chart in visualizations.items():
+        filename = _viz_filename(name)
+        data = chart.encode('utf-8') if isinstance(chart, str) else orjson.dumps(chart)
+        _write_atomic(os.path.join(session_dir, filename), data)
+        if isinstance(chart, str):
+            for _, suffix, compress in PRECOMPRESSED_ENCODINGS:
+                _write_atomic(os.path.join(session_dir, filename + suffix), compress(data))
+        files[name] = filename
+    return files
+
+def _load_visualization(session_dir, filename):
+    """Read one stored visualization, leaving single figures as JSON strings"""
+    with open(os.path.join(session_dir, filename), 'rb', buffering=IO_BUFFER_SIZE) as f:
+        raw = f.read()
+    return orjson.loads(raw) if raw.lstrip()[:1] == b'[' else raw.decode('utf-8')
+
+@lru_cache(maxsize=SESSION_CACHE_SIZE)
+def _load_session_file(session_file, mtime_ns):
+    """Parse a session file along with the figures and mission data stored beside it"""
+    # Cached on mtime_ns, so a rewritten session is re-read
+    session_data = _load_json_file(session_file)
+    session_dir = os.path.dirname(session_file)
+    files = session_data.pop('visualization_files', None)
+    if files is not None:
+        session_data['visualizations'] = {name: _load_visualization(session_dir, filename)
+                                          for name, filename in files.items()}
+    if 'mission_data' not in session_data:
+        session_data['mission_data'] = _load_json_file(os.path.join(session_dir, 'mission_stats.json'))
+    return session_data
+
+def _session_dir(session_id):
+    """Results directory of a session; the id is sanitized so it cannot leave RESULTS_FOLDER"""
+    return os.path.join(RESULTS_FOLDER, secure_filename(session_id))
+
+def _load_session(session_id):
+    """Return the parsed (shared, read-only) session data of a completed analysis"""
+    session_file = os.path.join(_session_dir(session_id), SESSION_FILE)
+    return _load_session_file(session_file, os.stat(session_file).st_mtime_ns)
+
+def _session_visualization(session_id, name):
+    """Return one visualization of a completed analysis, building and saving it on first request"""
+    builder = dict(MissionAnalyzer.CHART_BUILDERS)[name]
+    session_data = _load_session(session_id)
+    # Sessions analyzed before lazy building carry all of their charts
+    if 'visualizations' in session_data:
+        return session_data['visualizations'][name]
+    
+    session_dir = _session_dir(session_id)
+    try:
+        return _load_visualization(session_dir, _viz_filename(name))
+    except FileNotFoundError:
+        pass
+    
+    analyzer = MissionAnalyzer(secure_filename(session_id), session_data.get('mission_metadata'))
+    chart = getattr(analyzer, builder)(session_data['mission_data'])
+    _save_visualizations(session_dir, {name: chart})
+    return chart
+
+# Debrief log header fields that identify a mission, compiled once; they match the
+# raw bytes of the log so only the captured values are ever decoded
+MISSION_PATH_RE = re.compile(rb'mission_file_path\s*=\s*"([^"]*)"')
+MISSION_MARK_RE = re.compile(rb'mission_file_mark\s*=\s*(\d+)')
+MISSION_TIME_RE = re.compile(rb'mission_time\s*=\s*([0-9.]+)')
+# Characters not allowed in the mission name part of a session id
+MISSION_NAME_UNSAFE_RE = re.compile(r'[^\w\-_.]')
+# The header fields sit near the top of the log, so it is scanned in chunks
+# that stop as soon as all of them are found
+METADATA_SCAN_CHUNK = 64 * 1024
+METADATA_SCAN_OVERLAP = 4096  # Longer than any header line, so no match is lost at a chunk boundary
+
+def _search_stream(file, head, patterns):
+    """Return the first match of each pattern in a binary file, starting with head"""
+    # Chunks are read only while a pattern is unmatched; a match reaching the end of
+    # the text read so far is retried with the next chunk, as its groups may continue
+    matches = [None] * len(patterns)
+    window = head
+    eof = len(head) < METADATA_SCAN_CHUNK
+    while True:
+        for i, pattern in enumerate(patterns):
+            if matches[i] is None:
+                match = pattern.search(window)
+                if match and (eof or match.end() < len(window)):
+                    matches[i] = match
+        if eof or all(matches):
+            return matches
+        chunk = file.read(METADATA_SCAN_CHUNK)
+        eof = len(chunk) < METADATA_SCAN_CHUNK
+        window = window[-METADATA_SCAN_OVERLAP:] + chunk
 
 def extract_mission_metadata(debrief_log_path):
     """Extract mission metadata from debrief log to create unique identifier"""
     try:
-        with open(debrief_log_path, 'r', encoding='utf-8', errors='ignore') as file:
-            content = file.read()
+        with open(debrief_log_path, 'rb', buffering=IO_BUFFER_SIZE) as file:
+            head = file.read(METADATA_SCAN_CHUNK)
+            mission_path_match, file_mark_match, mission_time_match = _search_stream(
+                file, head, (MISSION_PATH_RE, MISSION_MARK_RE, MISSION_TIME_RE))
         
         metadata = {}
         
         # Extract mission file path
-        mission_path_match = re.search(r'mission_file_path\s*=\s*"([^"]*)"', content)
         if mission_path_match:
-            full_path = mission_path_match.group(1)
+            full_path = mission_path_match.group(1).decode('utf-8', errors='ignore')
             # Extract just the mission filename without path and extension
             # Handle both Windows and Unix paths
             mission_filename = os.path.basename(full_path.replace('\\', '/'))
             if mission_filename.endswith('.miz'):
                 mission_filename = mission_filename[:-4]  # Remove .miz extension
             # Clean up the filename for use in filesystem
-            mission_filename = re.sub(r'[^\w\-_.]', '_', mission_filename)
+            mission_filename = MISSION_NAME_UNSAFE_RE.sub('_', mission_filename)
             metadata['mission_name'] = mission_filename
         else:
             metadata['mission_name'] = 'unknown_mission'
         
         # Extract mission file mark (timestamp)
-        file_mark_match = re.search(r'mission_file_mark\s*=\s*(\d+)', content)
         if file_mark_match:
             metadata['mission_file_mark'] = int(file_mark_match.group(1))
         else:
             metadata['mission_file_mark'] = 0
         
         # Extract mission time (duration)
-        mission_time_match = re.search(r'mission_time\s*=\s*([0-9.]+)', content)
         if mission_time_match:
             metadata['mission_time'] = float(mission_time_match.group(1))
         else:
@@ -88,8 +405,9 @@ def extract_mission_metadata(debrief_log_path):
         # Format: missionname_timestamp_duration
         mission_id = f"{metadata['mission_name']}_{metadata['mission_file_mark']}_{int(metadata['mission_time'])}"
         
-        # Add a short hash to ensure uniqueness in case of collisions
-        content_hash = hashlib.md5(content[:1000].encode('utf-8')).hexdigest()[:8]
+        # Add a short hash to ensure uniqueness in case of collisions; it is not a
+        # security boundary, so a 4-byte BLAKE2b digest gives the 8 hex chars directly
+        content_hash = hashlib.blake2b(head[:1000], digest_size=4).hexdigest()
         mission_id = f"{mission_id}_{content_hash}"
         
         metadata['mission_id'] = mission_id
@@ -98,9 +416,9 @@ def extract_mission_metadata(debrief_log_path):
         
     except Exception as e:
         print(f"Error extracting mission metadata: {e}")
-        # Fallback to timestamp-based ID
-        now = datetime.now()
-        fallback_id = f"mission_{now.strftime('%Y%m%d_%H%M%S')}_{now.microsecond:06d}"
+        # Fallback to a timestamp-based ID; the random suffix keeps concurrent
+        # uploads in the same instant (or on other workers) from sharing a session
+        fallback_id = f"mission_{datetime.now():%Y%m%d_%H%M%S}_{secrets.token_hex(4)}"
         return {
             'mission_id': fallback_id,
             'mission_name': 'unknown_mission',
@@ -108,6 +426,35 @@ def extract_mission_metadata(debrief_log_path):
             'mission_time': 0.0
         }
 
+@dataclass(slots=True)
+class WeaponAgg:
+    """Aggregated usage and derived metrics for a single weapon type"""
+    shots: int = 0
+    kills: int = 0
+    hits: int = 0
+    pilots_used: int = 0
+    red_usage: int = 0
+    blue_usage: int = 0
+    accuracy: float = 0.0
+    effectiveness: float = 0.0
+    lethality: float = 0.0
+    usage_score: int = 0
+    reliability: int = 0
+
+@dataclass(slots=True)
+class TimelineEvent:
+    """A single marker on the combat timeline"""
+    time: float
+    event_type: str
+    pilot: str
+    aircraft: str
+    coalition: int
+    details: str
+    track: str
+    priority: int
+    color: str
+    weapon: str = None
+
 class MissionAnalyzer:
     def __init__(self, mission_id, mission_metadata=None):
         self.mission_id = mission_id
@@ -119,57 +466,48 @@ class MissionAnalyzer:
         """Process the uploaded files through the analysis pipeline"""
         try:
             xml_output_path = os.path.join(self.session_dir, 'unit_group_mapping.xml')
+            session_debrief_path = os.path.join(self.session_dir, 'debrief.log')
             
-            # Step 1: Extract XML using dcs_xml_extractor.py (only if dcs.log is provided)
-            if dcs_log_path and os.path.exists(dcs_log_path):
-                result = subprocess.run([
-                    'python3', 'dcs_xml_extractor.py',
-                    '--log', dcs_log_path,
-                    '--output', xml_output_path
-                ], capture_output=True, text=True, cwd='.')
+            # Steps 1 and 2 are independent, so the debrief log copy (a hardlink, or
+            # file I/O that releases the GIL) runs on a helper thread while the XML is extracted
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix='debrief-copy') as copier:
+                # Step 2: Copy debrief log to session directory
+                debrief_copied = copier.submit(_copy_file, debrief_log_path, session_debrief_path)
                 
-                if result.returncode != 0:
-                    return False, f"XML extraction failed: {result.stderr}"
-            else:
-                # Create a minimal XML file if no dcs.log is provided
-                # This allows the mission analyzer to work with just debrief.log
-                minimal_xml = '''<?xml version="1.0" encoding="UTF-8"?>
+                # Step 1: Extract XML in-process (only if dcs.log is provided)
+                if dcs_log_path and os.path.exists(dcs_log_path):
+                    success, error = extract_xml(dcs_log_path, xml_output_path,
+                                                 debug_log_path=os.path.join(self.session_dir, 'extractor.log'))
+                    
+                    if not success:
+                        return False, f"XML extraction failed: {error}"
+                else:
+                    # Create a minimal XML file if no dcs.log is provided
+                    # This allows the mission analyzer to work with just debrief.log
+                    minimal_xml = '''<?xml version="1.0" encoding="UTF-8"?>
 <mission>
     <groups>
     </groups>
     <units>
     </units>
 </mission>'''
-                with open(xml_output_path, 'w') as f:
-                    f.write(minimal_xml)
-            
-            # Step 2: Copy debrief log to session directory
-            session_debrief_path = os.path.join(self.session_dir, 'debrief.log')
-            shutil.copy2(debrief_log_path, session_debrief_path)
+                    with open(xml_output_path, 'w') as f:
+                        f.write(minimal_xml)
+                
+                # Step 3 reads both files, so wait for the copy (re-raising its errors)
+                debrief_copied.result()
             
-            # Step 3: Run mission analyzer
+            # Step 3: Run mission analyzer in-process
             json_output_path = os.path.join(self.session_dir, 'mission_stats.json')
             
-            result = subprocess.run([
-                'python3', 'dcs_mission_analyzer.py',
-                '--debrief', session_debrief_path,
-                '--mapping', xml_output_path,
-                '--export', json_output_path,
-                '--json-only'
-            ], capture_output=True, text=True, cwd='.')
-            
-            if result.returncode != 0:
-                return False, f"Mission analysis failed: {result.stderr}"
+            try:
+                mission_data = analyze_mission(session_debrief_path, xml_output_path,
+                                               debug_log_path=os.path.join(self.session_dir, 'analyzer.log'))
+            except Exception as e:
+                return False, f"Mission analysis failed: {str(e)}"
             
-            # Step 4: Load and enhance the results with mission metadata
-            with open(json_output_path, 'r') as f:
-                mission_data = json.load(f)
-            
-            # Add mission metadata to the results
-            if 'mission_summary' not in mission_data:
-                mission_data['mission_summary'] = {}
-            
-            mission_data['mission_summary'].update({
+            # Step 4: Enhance the results with mission metadata
+            mission_data.setdefault('mission_summary', {}).update({
                 'mission_name': self.mission_metadata.get('mission_name', 'Unknown Mission'),
                 'mission_file_mark': self.mission_metadata.get('mission_file_mark', 0),
                 'mission_id': self.mission_id,
@@ -178,55 +516,71 @@ class MissionAnalyzer:
             })
             
             # Save the enhanced mission data
-            with open(json_output_path, 'w') as f:
-                json.dump(mission_data, f, indent=2)
+            # orjson writes NaN as null, so the file is strict JSON that can be served as-is;
+            # it is written compact since it is only ever parsed, never read by hand
+            with open(json_output_path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+                f.write(orjson.dumps(mission_data, option=orjson.OPT_NON_STR_KEYS))
             
             return True, mission_data
             
         except Exception as e:
             return False, f"Processing error: {str(e)}"
     
+    # Coalition id -> (line color, display label, fill color) for per-coalition charts
+    COALITION_STYLE = {
+        1: ('red', 'Red', 'rgba(255, 0, 0, 0.3)'),
+        2: ('blue', 'Blue', 'rgba(0, 0, 255, 0.3)'),
+    }
+    
+    # Timeline marker symbol per event type (anything else is drawn as a circle)
+    EVENT_SYMBOLS = {
+        'Engine Startup': 'circle',
+        'First Shot': 'triangle-up',
+        'First Kill': 'star',
+        'Pilot Death': 'x',
+        'Ejection': 'diamond',
+        'Weapon Fire': 'square',
+        'Mission Start': 'star',
+        'Mission End': 'star'
+    }
+    
+    # Timeline tracks with enough events to be drawn with WebGL and no text labels
+    HIGH_VOLUME_TRACKS = frozenset(('Weapons', 'Combat Actions'))
+    
+    # Chart name -> builder method, in dashboard order
+    CHART_BUILDERS = [
+        ('mission_overview', 'create_mission_overview'),
+        ('pilot_performance', 'create_pilot_performance_charts'),
+        ('weapon_effectiveness', 'create_weapon_effectiveness_chart'),
+        ('group_comparison', 'create_group_comparison_chart'),
+        ('combat_timeline', 'create_combat_timeline'),
+        ('kill_death_network', 'create_kill_death_network'),
+        ('efficiency_leaderboard', 'create_efficiency_leaderboard'),
+        ('air_to_ground_analysis', 'create_air_to_ground_analysis'),
+        ('ag_pilot_dashboard', 'create_ag_pilot_dashboard'),
+        ('ag_group_dashboard', 'create_ag_group_dashboard'),
+    ]
+    
+    # Scalar per-pilot fields the summary charts read as columns
+    PILOT_SUMMARY_COLUMNS = ['coalition', 'efficiency_rating', 'kills', 'shots_fired']
+    
+    def _pilot_frame(self, data):
+        """Columnar view of the per-pilot summary fields, indexed by pilot name"""
+        import pandas as pd
+        pilots = data.get('pilots', {})
+        return pd.DataFrame(list(pilots.values()), index=list(pilots),
+                            columns=self.PILOT_SUMMARY_COLUMNS, dtype='float64').fillna(0)
+    
     def create_visualizations(self, mission_data):
         """Create all visualizations from mission data"""
-        visualizations = {}
-        
-        # 1. Mission Overview Chart
-        visualizations['mission_overview'] = self.create_mission_overview(mission_data)
-        
-        # 2. Pilot Performance Radar Charts
-        visualizations['pilot_performance'] = self.create_pilot_performance_charts(mission_data)
-        
-        # 3. Weapon Effectiveness Chart
-        visualizations['weapon_effectiveness'] = self.create_weapon_effectiveness_chart(mission_data)
-        
-        # 4. Group Comparison Chart
-        visualizations['group_comparison'] = self.create_group_comparison_chart(mission_data)
-        
-        # 5. Combat Timeline
-        visualizations['combat_timeline'] = self.create_combat_timeline(mission_data)
-        
-        # 6. Kill/Death Network
-        visualizations['kill_death_network'] = self.create_kill_death_network(mission_data)
-        
-        # 7. Efficiency Leaderboard
-        visualizations['efficiency_leaderboard'] = self.create_efficiency_leaderboard(mission_data)
-        
-        # 8. Air-to-Ground Analysis
-        visualizations['air_to_ground_analysis'] = self.create_air_to_ground_analysis(mission_data)
-        
-        # 9. Air-to-Ground per Pilot Dashboard
-        visualizations['ag_pilot_dashboard'] = self.create_ag_pilot_dashboard(mission_data)
-        
-        # 10. Air-to-Ground per Group Dashboard
-        visualizations['ag_group_dashboard'] = self.create_ag_group_dashboard(mission_data)
-        
-        return visualizations
+        return {name: getattr(self, builder)(mission_data) for name, builder in self.CHART_BUILDERS}
     
     def create_mission_overview(self, data):
         """Create mission overview dashboard"""
         summary = data.get('mission_summary', {})
         
-        fig = make_subplots(
+        layout, cells = _subplot_spec(
+            'mission_overview',
             rows=2, cols=2,
             subplot_titles=('Mission Duration', 'Combat Statistics', 'Pilot Count', 'Group Count'),
             specs=[[{"type": "indicator"}, {"type": "bar"}],
@@ -235,223 +589,183 @@ class MissionAnalyzer:
         
         # Mission duration indicator
         duration_min = summary.get('duration', 0) / 60
-        fig.add_trace(go.Indicator(
-            mode="gauge+number",
-            value=duration_min,
-            title={'text': "Duration (minutes)"},
-            gauge={'axis': {'range': [None, max(60, duration_min * 1.2)]},
-                   'bar': {'color': "darkblue"},
-                   'steps': [{'range': [0, 30], 'color': "lightgray"},
-                            {'range': [30, 60], 'color': "gray"}],
-                   'threshold': {'line': {'color': "red", 'width': 4},
-                               'thickness': 0.75, 'value': 90}}
-        ), row=1, col=1)
-        
-        # Combat statistics bar chart
-        pilots = data.get('pilots', {})
-        total_kills = sum(p.get('kills', 0) for p in pilots.values())
-        total_shots = sum(p.get('shots_fired', 0) for p in pilots.values())
-        
-        fig.add_trace(go.Bar(
-            x=['Kills', 'Shots'],
-            y=[total_kills, total_shots],
-            marker_color=['green', 'blue']
-        ), row=1, col=2)
-        
-        # Pilot count indicator
-        fig.add_trace(go.Indicator(
-            mode="number",
-            value=summary.get('active_pilots', 0),
-            title={'text': "Active Pilots"}
-        ), row=2, col=1)
-        
-        # Group count indicator
-        fig.add_trace(go.Indicator(
-            mode="number",
-            value=summary.get('active_groups', 0),
-            title={'text': "Active Groups"}
-        ), row=2, col=2)
-        
-        fig.update_layout(
-            title="Mission Overview Dashboard",
+        
+        # Combat totals in one NumPy reduction over the pilot frame's float64 columns
+        totals = self._pilot_frame(data)[['kills', 'shots_fired']].to_numpy().sum(axis=0)
+        total_kills, total_shots = totals.astype(int).tolist()
+        
+        traces = [
+            {
+                'type': 'indicator', **cells[1, 1],
+                'mode': "gauge+number",
+                'value': duration_min,
+                'title': {'text': "Duration (minutes)"},
+                'gauge': {'axis': {'range': [None, max(60, duration_min * 1.2)]},
+                          'bar': {'color': "darkblue"},
+                          'steps': [{'range': [0, 30], 'color': "lightgray"},
+                                    {'range': [30, 60], 'color': "gray"}],
+                          'threshold': {'line': {'color': "red", 'width': 4},
+                                        'thickness': 0.75, 'value': 90}}
+            },
+            # Combat statistics bar chart
+            {
+                'type': 'bar', **cells[1, 2],
+                'x': ['Kills', 'Shots'],
+                'y': [total_kills, total_shots],
+                'marker': {'color': ['green', 'blue']}
+            },
+            # Pilot count indicator
+            {
+                'type': 'indicator', **cells[2, 1],
+                'mode': "number",
+                'value': summary.get('active_pilots', 0),
+                'title': {'text': "Active Pilots"}
+            },
+            # Group count indicator
+            {
+                'type': 'indicator', **cells[2, 2],
+                'mode': "number",
+                'value': summary.get('active_groups', 0),
+                'title': {'text': "Active Groups"}
+            },
+        ]
+        
+        layout.update(
+            title={'text': "Mission Overview Dashboard"},
             showlegend=False,
             height=600
         )
         
-        return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+        return _plotly_dumps({'data': traces, 'layout': layout})
     
     def create_pilot_performance_charts(self, data):
         """Create radar charts for all pilots, organized by coalition"""
         pilots = data.get('pilots', {})
         
-        # Separate pilots by coalition
-        red_pilots = []
-        blue_pilots = []
-        
-        for pilot_name, pilot_data in pilots.items():
-            # Show all pilots, regardless of activity level
-            pilot_info = {
-                'name': pilot_name,
-                'data': pilot_data,
-                'coalition': pilot_data.get('coalition', 0),
-                'is_player_controlled': pilot_data.get('is_player_controlled', False)
-            }
-            
-            if pilot_data.get('coalition') == 1:  # Red coalition
-                red_pilots.append(pilot_info)
-            elif pilot_data.get('coalition') == 2:  # Blue coalition
-                blue_pilots.append(pilot_info)
-        
-        # Sort pilots by efficiency rating within each coalition
-        red_pilots.sort(key=lambda x: x['data'].get('efficiency_rating', 0), reverse=True)
-        blue_pilots.sort(key=lambda x: x['data'].get('efficiency_rating', 0), reverse=True)
+        # Order all pilots by efficiency once; the stable sort keeps ties in log order
+        ranked = self._pilot_frame(data).sort_values('efficiency_rating', ascending=False, kind='stable')
         
         charts = []
         
-        # Create charts for Red coalition pilots
-        for pilot_info in red_pilots:
-            pilot_name = pilot_info['name']
-            pilot_data = pilot_info['data']
-            
-            # Normalize metrics to 0-100 scale
-            accuracy = pilot_data.get('accuracy', 0)
-            kd_ratio = min(pilot_data.get('kd_ratio', 0) * 20, 100)  # Cap at 100
-            efficiency = pilot_data.get('efficiency_rating', 0)
-            shots_fired = min(pilot_data.get('shots_fired', 0) * 10, 100)  # Scale shots
-            
-            fig = go.Figure()
-            
-            fig.add_trace(go.Scatterpolar(
-                r=[accuracy, kd_ratio, efficiency, shots_fired],
-                theta=['Accuracy', 'K/D Ratio', 'Efficiency', 'Activity'],
-                fill='toself',
-                name=pilot_name,
-                line_color='red',
-                fillcolor='rgba(255, 0, 0, 0.3)'
-            ))
-            
-            # Add player type indicator to title
-            player_type = "Human" if pilot_info['is_player_controlled'] else "AI"
-            
-            fig.update_layout(
-                polar=dict(
-                    radialaxis=dict(
-                        visible=True,
-                        range=[0, 100]
-                    )),
-                title=f"{pilot_name} ({pilot_data.get('aircraft_type', 'Unknown')}) - Red [{player_type}]",
-                showlegend=True,
-                height=400
-            )
-            
-            charts.append({
-                'pilot': pilot_name,
-                'coalition': 'red',
-                'is_player_controlled': pilot_info['is_player_controlled'],
-                'chart': json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
-            })
-        
-        # Create charts for Blue coalition pilots
-        for pilot_info in blue_pilots:
-            pilot_name = pilot_info['name']
-            pilot_data = pilot_info['data']
-            
-            # Normalize metrics to 0-100 scale
-            accuracy = pilot_data.get('accuracy', 0)
-            kd_ratio = min(pilot_data.get('kd_ratio', 0) * 20, 100)  # Cap at 100
-            efficiency = pilot_data.get('efficiency_rating', 0)
-            shots_fired = min(pilot_data.get('shots_fired', 0) * 10, 100)  # Scale shots
-            
-            fig = go.Figure()
-            
-            fig.add_trace(go.Scatterpolar(
-                r=[accuracy, kd_ratio, efficiency, shots_fired],
-                theta=['Accuracy', 'K/D Ratio', 'Efficiency', 'Activity'],
-                fill='toself',
-                name=pilot_name,
-                line_color='blue',
-                fillcolor='rgba(0, 0, 255, 0.3)'
-            ))
-            
-            # Add player type indicator to title
-            player_type = "Human" if pilot_info['is_player_controlled'] else "AI"
-            
-            fig.update_layout(
-                polar=dict(
-                    radialaxis=dict(
-                        visible=True,
-                        range=[0, 100]
-                    )),
-                title=f"{pilot_name} ({pilot_data.get('aircraft_type', 'Unknown')}) - Blue [{player_type}]",
-                showlegend=True,
-                height=400
-            )
-            
-            charts.append({
-                'pilot': pilot_name,
-                'coalition': 'blue',
-                'is_player_controlled': pilot_info['is_player_controlled'],
-                'chart': json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
-            })
+        # Red coalition pilots first, then Blue, each sorted by efficiency rating
+        for coalition, (color, label, fill) in self.COALITION_STYLE.items():
+            # Show all pilots, regardless of activity level
+            for pilot_name in ranked.index[ranked['coalition'] == coalition]:
+                pilot_data = pilots[pilot_name]
+                is_player_controlled = pilot_data.get('is_player_controlled', False)
+                
+                # Normalize metrics to 0-100 scale
+                accuracy = pilot_data.get('accuracy', 0)
+                kd_ratio = min(pilot_data.get('kd_ratio', 0) * 20, 100)  # Cap at 100
+                efficiency = pilot_data.get('efficiency_rating', 0)
+                shots_fired = min(pilot_data.get('shots_fired', 0) * 10, 100)  # Scale shots
+                
+                # Add player type indicator to title
+                player_type = "Human" if is_player_controlled else "AI"
+                title = f"{pilot_name} ({pilot_data.get('aircraft_type', 'Unknown')}) - {label} [{player_type}]"
+                
+                fig = self._make_radar(pilot_name, [accuracy, kd_ratio, efficiency, shots_fired],
+                                       color, fill, title)
+                
+                charts.append({
+                    'pilot': pilot_name,
+                    'coalition': color,
+                    'is_player_controlled': is_player_controlled,
+                    'chart': _plotly_dumps(fig)
+                })
         
         return charts
     
+    # Leaderboard star strings, indexed by np.digitize over the tier thresholds
+    STAR_TIERS = (20, 40, 60, 80)
+    STAR_RATINGS = ('★☆☆☆☆', '★★☆☆☆', '★★★☆☆', '★★★★☆', '★★★★★')
+    
+    PILOT_RADAR_AXES = ['Accuracy', 'K/D Ratio', 'Efficiency', 'Activity']
+    GROUP_RADAR_AXES = ['Accuracy', 'Survivability', 'Efficiency', 'Activity']
+    
+    def _make_radar(self, name, values, color, fill, title, theta=PILOT_RADAR_AXES):
+        """Build a single-trace radar chart as a raw figure dict"""
+        return _figure_spec(
+            [{
+                'type': 'scatterpolar',
+                'r': values,
+                'theta': theta,
+                'fill': 'toself',
+                'name': name,
+                'line': {'color': color},
+                'fillcolor': fill
+            }],
+            {
+                'polar': {'radialaxis': {'visible': True, 'range': [0, 100]}},
+                'title': {'text': title},
+                'showlegend': True,
+                'height': 400
+            }
+        )
+    
     def create_weapon_effectiveness_chart(self, data):
         """Create comprehensive weapon analysis dashboard with multiple engaging visualizations"""
+        import numpy as np
+        import pandas as pd
+        from plotly.colors import get_colorscale
         pilots = data.get('pilots', {})
         
-        # Aggregate comprehensive weapon data
-        weapon_stats = {}
-        pilot_weapon_preferences = {}
-        coalition_weapon_usage = {1: {}, 2: {}}
+        # Aggregate comprehensive weapon data: one long-form row per (pilot, weapon)
+        rows = [
+            (pilot_name, pilot_data.get('coalition', 0), pilot_data.get('aircraft_type', 'Unknown'),
+             weapon, shots, pilot_data.get('weapons_kills', {}).get(weapon, 0),
+             pilot_data.get('weapons_hit_with', {}).get(weapon, 0))
+            for pilot_name, pilot_data in pilots.items()
+            for weapon, shots in pilot_data.get('weapons_used', {}).items()
+        ]
+        
+        if not rows:
+            return _static_chart('weapon_effectiveness_empty', lambda: _figure_spec([], {
+                'annotations': [{'text': "No weapon data available", 'xref': "paper", 'yref': "paper",
+                                 'x': 0.5, 'y': 0.5, 'showarrow': False}]
+            }))
+        
+        df = pd.DataFrame(rows, columns=['pilot', 'coalition', 'aircraft', 'weapon', 'shots', 'kills', 'hits'])
+        # Coalition usage: each row's shots counted under its side only
+        df['red_usage'] = df['shots'].where(df['coalition'] == 1, 0)
+        df['blue_usage'] = df['shots'].where(df['coalition'] == 2, 0)
+        
+        # Keep first-seen weapon order so charts stay stable between builds
+        weapon_stats = df.groupby('weapon', sort=False).agg(
+            shots=('shots', 'sum'),
+            kills=('kills', 'sum'),
+            hits=('hits', 'sum'),
+            pilots_used=('pilot', 'nunique'),
+            red_usage=('red_usage', 'sum'),
+            blue_usage=('blue_usage', 'sum')
+        )
         
-        for pilot_name, pilot_data in pilots.items():
-            weapons_used = pilot_data.get('weapons_used', {})
-            weapons_kills = pilot_data.get('weapons_kills', {})
-            weapons_hits = pilot_data.get('weapons_hit_with', {})
-            coalition = pilot_data.get('coalition', 0)
-            
-            pilot_weapon_preferences[pilot_name] = {
-                'coalition': coalition,
-                'aircraft': pilot_data.get('aircraft_type', 'Unknown'),
-                'weapons': weapons_used,
-                'kills': weapons_kills,
-                'hits': weapons_hits
-            }
-            
-            for weapon, shots in weapons_used.items():
-                if weapon not in weapon_stats:
-                    weapon_stats[weapon] = {
-                        'shots': 0, 'kills': 0, 'hits': 0, 'pilots_used': 0,
-                        'red_usage': 0, 'blue_usage': 0, 'aircraft_types': set()
-                    }
-                
-                weapon_stats[weapon]['shots'] += shots
-                weapon_stats[weapon]['kills'] += weapons_kills.get(weapon, 0)
-                weapon_stats[weapon]['hits'] += weapons_hits.get(weapon, 0)
-                weapon_stats[weapon]['pilots_used'] += 1
-                weapon_stats[weapon]['aircraft_types'].add(pilot_data.get('aircraft_type', 'Unknown'))
-                
-                # Coalition usage tracking
-                if coalition in [1, 2]:
-                    if coalition == 1:
-                        weapon_stats[weapon]['red_usage'] += shots
-                    else:
-                        weapon_stats[weapon]['blue_usage'] += shots
-                    
-                    if weapon not in coalition_weapon_usage[coalition]:
-                        coalition_weapon_usage[coalition][weapon] = 0
-                    coalition_weapon_usage[coalition][weapon] += shots
-        
-        if not weapon_stats:
-            fig = go.Figure()
-            fig.add_annotation(text="No weapon data available", 
-                             xref="paper", yref="paper",
-                             x=0.5, y=0.5, showarrow=False)
-            return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
-        
-        # Create comprehensive weapons dashboard
-        fig = make_subplots(
+        # Bound the chart size on very large missions by keeping the most used weapons
+        kept_weapons = downsample(weapon_stats.index, key=lambda w: weapon_stats.at[w, 'shots'], cfg=PERF_CFG)
+        if len(kept_weapons) < len(weapon_stats):
+            weapon_stats = weapon_stats.loc[kept_weapons]
+        
+        shots = weapon_stats['shots'].to_numpy(dtype=float)
+        hits = weapon_stats['hits'].to_numpy(dtype=float)
+        kills = weapon_stats['kills'].to_numpy(dtype=float)
+        # Masked divides leave 0 wherever the denominator is 0
+        weapon_stats['accuracy'] = np.divide(hits, shots, out=np.zeros_like(shots), where=shots > 0) * 100
+        weapon_stats['effectiveness'] = np.divide(kills, shots, out=np.zeros_like(shots), where=shots > 0) * 100
+        weapon_stats['lethality'] = np.divide(kills, hits, out=np.zeros_like(hits), where=hits > 0) * 100
+        # Radar scores on a 0-100 scale: usage, and reliability from how many pilots used it
+        weapon_stats['usage_score'] = np.minimum(weapon_stats['shots'] * 10, 100)
+        weapon_stats['reliability'] = np.minimum(weapon_stats['pilots_used'] * 20, 100)
+        
+        # Per-weapon records for the loops below that work one weapon at a time
+        agg_columns = [f.name for f in fields(WeaponAgg)]
+        weapon_aggs = {
+            weapon: WeaponAgg(*values)
+            for weapon, *values in weapon_stats[agg_columns].itertuples(name=None)
+        }
+        
+        # Create comprehensive weapons dashboard as raw trace dicts on a cached grid
+        layout, cells = _subplot_spec(
+            'weapon_effectiveness',
             rows=3, cols=2,
             subplot_titles=(
                 'Weapon Effectiveness Matrix', 'Coalition Weapon Preferences',
@@ -466,265 +780,165 @@ class MissionAnalyzer:
             vertical_spacing=0.12,
             horizontal_spacing=0.1
         )
+        traces = []
         
         # 1. Weapon Effectiveness Matrix (Row 1, Col 1)
-        weapons = list(weapon_stats.keys())
-        effectiveness_data = []
-        accuracy_data = []
-        lethality_data = []
-        usage_data = []
-        
-        for weapon in weapons:
-            stats = weapon_stats[weapon]
-            shots = stats['shots']
-            hits = stats['hits']
-            kills = stats['kills']
-            
-            # Calculate metrics
-            accuracy = (hits / shots * 100) if shots > 0 else 0
-            effectiveness = (kills / shots * 100) if shots > 0 else 0
-            lethality = (kills / hits * 100) if hits > 0 else 0
-            
-            effectiveness_data.append(effectiveness)
-            accuracy_data.append(accuracy)
-            lethality_data.append(lethality)
-            usage_data.append(shots)
-        
-        # Create effectiveness matrix scatter plot
-        fig.add_trace(go.Scatter(
-            x=accuracy_data,
-            y=effectiveness_data,
-            mode='markers+text',
-            text=weapons,
-            textposition="top center",
-            marker=dict(
-                size=[max(10, min(u/2, 50)) for u in usage_data],  # Size based on usage
-                color=lethality_data,
-                colorscale='Viridis',
-                showscale=True,
-                colorbar=dict(title="Lethality %", x=0.48),
-                line=dict(width=2, color='white'),
-                opacity=0.8
-            ),
-            name="Weapons",
-            hovertemplate="<b>%{text}</b><br>" +
-                         "Accuracy: %{x:.1f}%<br>" +
-                         "Effectiveness: %{y:.1f}%<br>" +
-                         "Usage: %{customdata} shots<br>" +
-                         "Lethality: %{marker.color:.1f}%<extra></extra>",
-            customdata=usage_data
-        ), row=1, col=1)
+        weapons = weapon_stats.index.tolist()
+        weapon_categories = pd.Series(classify_weapons(weapon_stats.index), index=weapon_stats.index)
+        effectiveness_data = weapon_stats['effectiveness'].to_numpy()
+        accuracy_data = weapon_stats['accuracy'].to_numpy()
+        lethality_data = weapon_stats['lethality'].to_numpy()
+        usage_data = weapon_stats['shots'].to_numpy()
+        
+        # Create effectiveness matrix scatter plot (WebGL-rendered)
+        traces.append({
+            'type': 'scattergl', **cells[1, 1],
+            'x': _typed_array(accuracy_data),
+            'y': _typed_array(effectiveness_data),
+            'mode': 'markers+text',
+            'text': weapons,
+            'textposition': "top center",
+            'marker': {
+                'size': _typed_array(np.clip(usage_data / 2, 10, 50)),  # Size based on usage
+                'color': _typed_array(lethality_data),
+                'colorscale': get_colorscale('Viridis'),
+                'showscale': True,
+                'colorbar': {'title': {'text': "Lethality %"}, 'x': 0.48},
+                'line': {'width': 2, 'color': 'white'},
+                'opacity': 0.8
+            },
+            'name': "Weapons",
+            'hovertemplate': "<b>%{text}</b><br>" +
+                             "Accuracy: %{x:.1f}%<br>" +
+                             "Effectiveness: %{y:.1f}%<br>" +
+                             "Usage: %{customdata} shots<br>" +
+                             "Lethality: %{marker.color:.1f}%<extra></extra>",
+            'customdata': _typed_array(usage_data)
+        })
         
         # 2. Coalition Weapon Preferences (Row 1, Col 2)
-        red_weapons = []
-        blue_weapons = []
-        red_usage = []
-        blue_usage = []
-        
-        for weapon in weapons:
-            stats = weapon_stats[weapon]
-            if stats['red_usage'] > 0:
-                red_weapons.append(weapon)
-                red_usage.append(stats['red_usage'])
-            if stats['blue_usage'] > 0:
-                blue_weapons.append(weapon)
-                blue_usage.append(stats['blue_usage'])
-        
-        if red_weapons:
-            fig.add_trace(go.Bar(
-                x=red_weapons,
-                y=red_usage,
-                name="Red Coalition",
-                marker_color='red',
-                opacity=0.7,
-                hovertemplate="<b>%{x}</b><br>Red Coalition Usage: %{y} shots<extra></extra>"
-            ), row=1, col=2)
-        
-        if blue_weapons:
-            fig.add_trace(go.Bar(
-                x=blue_weapons,
-                y=blue_usage,
-                name="Blue Coalition",
-                marker_color='blue',
-                opacity=0.7,
-                hovertemplate="<b>%{x}</b><br>Blue Coalition Usage: %{y} shots<extra></extra>"
-            ), row=1, col=2)
+        for usage, name, color in (('red_usage', "Red Coalition", 'red'), ('blue_usage', "Blue Coalition", 'blue')):
+            side_stats = weapon_stats[weapon_stats[usage] > 0]
+            if not side_stats.empty:
+                traces.append({
+                    'type': 'bar', **cells[1, 2],
+                    'x': side_stats.index.tolist(),
+                    'y': _typed_array(side_stats[usage].to_numpy()),
+                    'name': name,
+                    'marker': {'color': color},
+                    'opacity': 0.7,
+                    'hovertemplate': f"<b>%{{x}}</b><br>{name} Usage: %{{y}} shots<extra></extra>"
+                })
         
         # 3. Weapon Performance Radar (Row 2, Col 1)
         # Select top 5 weapons by usage for radar chart
-        top_weapons = sorted(weapons, key=lambda w: weapon_stats[w]['shots'], reverse=True)[:5]
+        top_weapons = sorted(weapon_aggs.items(), key=lambda item: item[1].shots, reverse=True)[:5]
+        colors = ['red', 'blue', 'green', 'orange', 'purple']
         
-        for i, weapon in enumerate(top_weapons):
-            stats = weapon_stats[weapon]
-            shots = stats['shots']
-            hits = stats['hits']
-            kills = stats['kills']
-            
+        for i, (weapon, stats) in enumerate(top_weapons):
             # Normalize metrics to 0-100 scale
-            accuracy = (hits / shots * 100) if shots > 0 else 0
-            effectiveness = (kills / shots * 100) if shots > 0 else 0
-            lethality = (kills / hits * 100) if hits > 0 else 0
-            usage_score = min(shots * 10, 100)  # Scale usage
-            reliability = min(stats['pilots_used'] * 20, 100)  # Based on how many pilots used it
-            
-            colors = ['red', 'blue', 'green', 'orange', 'purple']
-            
-            fig.add_trace(go.Scatterpolar(
-                r=[accuracy, effectiveness, lethality, usage_score, reliability],
-                theta=['Accuracy', 'Effectiveness', 'Lethality', 'Usage', 'Reliability'],
-                fill='toself',
-                name=weapon,
-                line_color=colors[i % len(colors)],
-                fillcolor=f'rgba({255 if i%2==0 else 0}, {128 if i%3==0 else 0}, {255 if i%2==1 else 0}, 0.3)',
-                hovertemplate="<b>" + weapon + "</b><br>" +
-                             "Accuracy: " + f"{accuracy:.1f}%" + "<br>" +
-                             "Effectiveness: " + f"{effectiveness:.1f}%" + "<br>" +
-                             "Lethality: " + f"{lethality:.1f}%" + "<br>" +
-                             "Usage Score: " + f"{usage_score:.1f}" + "<br>" +
-                             "Reliability: " + f"{reliability:.1f}" + "<extra></extra>"
-            ), row=2, col=1)
+            accuracy = stats.accuracy
+            effectiveness = stats.effectiveness
+            lethality = stats.lethality
+            usage_score = stats.usage_score
+            reliability = stats.reliability
+            
+            traces.append({
+                'type': 'scatterpolar', **cells[2, 1],
+                'r': [accuracy, effectiveness, lethality, usage_score, reliability],
+                'theta': ['Accuracy', 'Effectiveness', 'Lethality', 'Usage', 'Reliability'],
+                'fill': 'toself',
+                'name': weapon,
+                'line': {'color': colors[i % len(colors)]},
+                'fillcolor': f'rgba({255 if i%2==0 else 0}, {128 if i%3==0 else 0}, {255 if i%2==1 else 0}, 0.3)',
+                'hovertemplate': "<b>" + weapon + "</b><br>" +
+                                 "Accuracy: " + f"{accuracy:.1f}%" + "<br>" +
+                                 "Effectiveness: " + f"{effectiveness:.1f}%" + "<br>" +
+                                 "Lethality: " + f"{lethality:.1f}%" + "<br>" +
+                                 "Usage Score: " + f"{usage_score:.1f}" + "<br>" +
+                                 "Reliability: " + f"{reliability:.1f}" + "<extra></extra>"
+            })
         
         # 4. Lethality vs Usage Analysis (Row 2, Col 2)
-        weapon_categories = []
-        lethality_for_scatter = []  # Separate lethality array for this chart
-        
-        for weapon in weapons:
-            stats = weapon_stats[weapon]
-            shots = stats['shots']
-            hits = stats['hits']
-            kills = stats['kills']
-            
-            # Calculate lethality correctly
-            lethality = (kills / hits * 100) if hits > 0 else 0
-            lethality_for_scatter.append(lethality)
-            
-            # Categorize weapons
-            if 'AIM' in weapon or 'missile' in weapon.lower():
-                category = 'Air-to-Air Missile'
-            elif 'PGU' in weapon or 'gun' in weapon.lower() or 'cannon' in weapon.lower():
-                category = 'Gun/Cannon'
-            elif 'bomb' in weapon.lower() or 'AGM' in weapon:
-                category = 'Air-to-Ground'
-            else:
-                category = 'Other'
-            
-            weapon_categories.append(category)
-        
-        # Create lethality vs usage scatter
-        fig.add_trace(go.Scatter(
-            x=usage_data,
-            y=lethality_for_scatter,  # Use the correctly calculated lethality
-            mode='markers+text',
-            text=weapons,
-            textposition="top center",
-            marker=dict(
-                size=[max(15, min(e*2, 40)) for e in effectiveness_data],
-                color=[{'Air-to-Air Missile': 'blue', 'Gun/Cannon': 'red', 
-                       'Air-to-Ground': 'green', 'Other': 'gray'}[cat] for cat in weapon_categories],
-                opacity=0.7,
-                line=dict(width=2, color='white')
-            ),
-            name="Weapon Types",
-            customdata=[[weapon_stats[w]['hits'], weapon_stats[w]['kills']] for w in weapons],
-            hovertemplate="<b>%{text}</b><br>" +
-                         "Usage: %{x} shots<br>" +
-                         "Lethality: %{y:.1f}%<br>" +
-                         "Hits: %{customdata[0]}<br>" +
-                         "Kills: %{customdata[1]}<extra></extra>"
-        ), row=2, col=2)
+        category_colors = weapon_categories.map(WEAPON_CATEGORY_COLORS)
+        
+        # Create lethality vs usage scatter (WebGL-rendered)
+        traces.append({
+            'type': 'scattergl', **cells[2, 2],
+            'x': _typed_array(usage_data),
+            'y': _typed_array(lethality_data),
+            'mode': 'markers+text',
+            'text': weapons,
+            'textposition': "top center",
+            'marker': {
+                'size': _typed_array(np.clip(effectiveness_data * 2, 15, 40)),
+                'color': category_colors.tolist(),
+                'opacity': 0.7,
+                'line': {'width': 2, 'color': 'white'}
+            },
+            'name': "Weapon Types",
+            'customdata': _typed_array(weapon_stats[['hits', 'kills']].to_numpy()),
+            'hovertemplate': "<b>%{text}</b><br>" +
+                             "Usage: %{x} shots<br>" +
+                             "Lethality: %{y:.1f}%<br>" +
+                             "Hits: %{customdata[0]}<br>" +
+                             "Kills: %{customdata[1]}<extra></extra>"
+        })
         
         # 5. Pilot Weapon Mastery Heatmap (Row 3, Col 1)
         # Create heatmap of pilot vs weapon effectiveness
-        active_pilots = [p for p, data in pilot_weapon_preferences.items() 
-                        if sum(data['weapons'].values()) > 0][:8]  # Top 8 active pilots
+        pilot_shots = df.groupby('pilot', sort=False)['shots'].sum()
+        active_pilots = downsample(
+            pilot_shots.index[pilot_shots.to_numpy() > 0],
+            key=pilot_shots.__getitem__,
+            cfg=PERF_CFG, limit=PERF_CFG.max_heatmap_rows
+        )  # Top 8 active pilots
         
         if active_pilots and weapons:
-            heatmap_data = []
-            pilot_labels = []
-            
-            for pilot in active_pilots:
-                pilot_data = pilot_weapon_preferences[pilot]
-                row_data = []
-                pilot_labels.append(f"{pilot}<br>({pilot_data['aircraft']})")
-                
-                for weapon in weapons:
-                    pilot_shots = pilot_data['weapons'].get(weapon, 0)
-                    pilot_kills = pilot_data['kills'].get(weapon, 0)
-                    mastery = (pilot_kills / pilot_shots * 100) if pilot_shots > 0 else 0
-                    row_data.append(mastery)
-                
-                heatmap_data.append(row_data)
-            
-            fig.add_trace(go.Heatmap(
-                z=heatmap_data,
-                x=weapons,
-                y=pilot_labels,
-                colorscale='RdYlBu_r',
-                showscale=True,
-                colorbar=dict(title="Mastery %", x=1.02),
-                hovertemplate="<b>%{y}</b><br>Weapon: %{x}<br>Mastery: %{z:.1f}%<extra></extra>"
-            ), row=3, col=1)
+            # Dense pilot x weapon shot and kill grids for the kept pilots only; pairs a
+            # pilot never fired are 0 and score 0 mastery (kills per shot)
+            active_rows = df[df['pilot'].isin(active_pilots)]
+            grid = active_rows.pivot(index='pilot', columns='weapon', values=['shots', 'kills'])
+            shots_mat = grid['shots'].reindex(index=active_pilots, columns=weapons).fillna(0).to_numpy(dtype=float)
+            kills_mat = grid['kills'].reindex(index=active_pilots, columns=weapons).fillna(0).to_numpy(dtype=float)
+            heatmap_data = np.divide(kills_mat, shots_mat, out=np.zeros_like(shots_mat), where=shots_mat > 0) * 100
+            pilot_aircraft = active_rows.groupby('pilot', sort=False)['aircraft'].first()
+            pilot_labels = [f"{pilot}<br>({pilot_aircraft[pilot]})" for pilot in active_pilots]
+            
+            traces.append({
+                'type': 'heatmap', **cells[3, 1],
+                'z': _typed_array(heatmap_data),
+                'x': weapons,
+                'y': pilot_labels,
+                'colorscale': get_colorscale('RdYlBu_r'),
+                'showscale': True,
+                'colorbar': {'title': {'text': "Mastery %"}, 'x': 1.02},
+                'hovertemplate': "<b>%{y}</b><br>Weapon: %{x}<br>Mastery: %{z:.1f}%<extra></extra>"
+            })
         
         # 6. Weapon Platform Analysis (Row 3, Col 2) - Sunburst chart
-        # Create hierarchical data for sunburst
-        sunburst_data = {
-            'ids': [],
-            'labels': [],
-            'parents': [],
-            'values': []
-        }
-        
-        # Add root
-        sunburst_data['ids'].append('weapons')
-        sunburst_data['labels'].append('All Weapons')
-        sunburst_data['parents'].append('')
-        sunburst_data['values'].append(sum(weapon_stats[w]['shots'] for w in weapons))
-        
-        # Add weapon categories
-        categories = {}
-        for weapon in weapons:
-            if 'AIM' in weapon or 'missile' in weapon.lower():
-                cat = 'Missiles'
-            elif 'PGU' in weapon or 'gun' in weapon.lower():
-                cat = 'Guns'
-            else:
-                cat = 'Other'
-            
-            if cat not in categories:
-                categories[cat] = 0
-            categories[cat] += weapon_stats[weapon]['shots']
-        
-        for cat, usage in categories.items():
-            sunburst_data['ids'].append(cat)
-            sunburst_data['labels'].append(cat)
-            sunburst_data['parents'].append('weapons')
-            sunburst_data['values'].append(usage)
-        
-        # Add individual weapons
-        for weapon in weapons:
-            if 'AIM' in weapon or 'missile' in weapon.lower():
-                parent = 'Missiles'
-            elif 'PGU' in weapon or 'gun' in weapon.lower():
-                parent = 'Guns'
-            else:
-                parent = 'Other'
-            
-            sunburst_data['ids'].append(weapon)
-            sunburst_data['labels'].append(weapon)
-            sunburst_data['parents'].append(parent)
-            sunburst_data['values'].append(weapon_stats[weapon]['shots'])
-        
-        fig.add_trace(go.Sunburst(
-            ids=sunburst_data['ids'],
-            labels=sunburst_data['labels'],
-            parents=sunburst_data['parents'],
-            values=sunburst_data['values'],
-            branchvalues="total",
-            hovertemplate="<b>%{label}</b><br>Usage: %{value} shots<br>Percentage: %{percentParent}<extra></extra>"
-        ), row=3, col=2)
+        # Create hierarchical data for sunburst from the shared weapon categories;
+        # category totals keep the order in which each category first appears
+        sunburst_parent = {'Air-to-Air Missile': 'Missiles', 'Gun/Cannon': 'Guns'}
+        weapon_parents = weapon_categories.map(sunburst_parent).fillna('Other')
+        weapon_shots = weapon_stats['shots']
+        category_totals = weapon_shots.groupby(weapon_parents, sort=False).sum()
+        
+        # Root, then categories, then individual weapons
+        categories = category_totals.index.tolist()
+        
+        traces.append({
+            'type': 'sunburst', **cells[3, 2],
+            'ids': ['weapons'] + categories + weapons,
+            'labels': ['All Weapons'] + categories + weapons,
+            'parents': [''] + ['weapons'] * len(categories) + weapon_parents.tolist(),
+            'values': [int(weapon_shots.sum())] + category_totals.tolist() + weapon_shots.tolist(),
+            'branchvalues': "total",
+            'hovertemplate': "<b>%{label}</b><br>Usage: %{value} shots<br>Percentage: %{percentParent}<extra></extra>"
+        })
         
         # Update layout
-        fig.update_layout(
+        layout.update(
             title={
                 'text': "Comprehensive Weapon Analysis Dashboard - Combat Effectiveness & Usage Patterns",
                 'x': 0.5,
@@ -742,22 +956,16 @@ class MissionAnalyzer:
         )
         
         # Update polar chart
-        fig.update_polars(
-            radialaxis=dict(visible=True, range=[0, 100]),
-            row=2, col=1
-        )
+        layout[cells[2, 1]['subplot']]['radialaxis'] = {'visible': True, 'range': [0, 100]}
         
         # Update axis labels
-        fig.update_xaxes(title_text="Accuracy (%)", row=1, col=1)
-        fig.update_yaxes(title_text="Effectiveness (%)", row=1, col=1)
-        fig.update_xaxes(title_text="Weapon Type", row=1, col=2)
-        fig.update_yaxes(title_text="Shots Fired", row=1, col=2)
-        fig.update_xaxes(title_text="Total Usage (Shots)", row=2, col=2)
-        fig.update_yaxes(title_text="Lethality (%)", row=2, col=2)
-        fig.update_xaxes(title_text="Weapon", row=3, col=1)
-        fig.update_yaxes(title_text="Pilot", row=3, col=1)
-        
-        return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+        for cell, axis, title in (((1, 1), 'x', "Accuracy (%)"), ((1, 1), 'y', "Effectiveness (%)"),
+                                  ((1, 2), 'x', "Weapon Type"), ((1, 2), 'y', "Shots Fired"),
+                                  ((2, 2), 'x', "Total Usage (Shots)"), ((2, 2), 'y', "Lethality (%)"),
+                                  ((3, 1), 'x', "Weapon"), ((3, 1), 'y', "Pilot")):
+            _cell_axis(layout, cells[cell], axis)['title'] = {'text': title}
+        
+        return _plotly_dumps({'data': traces, 'layout': layout})
     
     def create_group_comparison_chart(self, data):
         """Create radar charts for all groups, organized by coalition (similar to pilot performance style)"""
@@ -767,117 +975,50 @@ class MissionAnalyzer:
             return []
         
         # Separate groups by coalition
-        red_groups = []
-        blue_groups = []
+        groups_by_coalition = {coalition: [] for coalition in self.COALITION_STYLE}
         
         for group_id, group_data in groups.items():
-            group_info = {
-                'id': group_id,
-                'name': group_data.get('name', 'Unknown'),
-                'data': group_data,
-                'coalition': group_data.get('coalition', 0)
-            }
-            
-            if group_data.get('coalition') == 1:  # Red coalition
-                red_groups.append(group_info)
-            elif group_data.get('coalition') == 2:  # Blue coalition
-                blue_groups.append(group_info)
-        
-        # Sort groups by average pilot efficiency within each coalition
-        red_groups.sort(key=lambda x: x['data'].get('average_pilot_efficiency', 0), reverse=True)
-        blue_groups.sort(key=lambda x: x['data'].get('average_pilot_efficiency', 0), reverse=True)
+            coalition = group_data.get('coalition')
+            if coalition in groups_by_coalition:
+                groups_by_coalition[coalition].append({
+                    'id': group_id,
+                    'name': group_data.get('name', 'Unknown'),
+                    'data': group_data,
+                    'coalition': coalition,
+                    'efficiency': group_data.get('average_pilot_efficiency', 0)
+                })
         
         charts = []
         
-        # Create charts for Red coalition groups
-        for group_info in red_groups:
-            group_name = group_info['name']
-            group_data = group_info['data']
+        # Red coalition groups first, then Blue, each sorted by average pilot efficiency
+        for coalition, (color, label, fill) in self.COALITION_STYLE.items():
+            coalition_groups = sorted(groups_by_coalition[coalition], key=itemgetter('efficiency'), reverse=True)
             
-            # Normalize metrics to 0-100 scale (same as pilot performance)
-            accuracy = group_data.get('group_accuracy', 0)
-            survivability = group_data.get('group_survivability', 0)
-            efficiency = group_data.get('average_pilot_efficiency', 0)
-            activity = min(group_data.get('total_shots', 0) * 5, 100)  # Scale activity
-            
-            fig = go.Figure()
-            
-            fig.add_trace(go.Scatterpolar(
-                r=[accuracy, survivability, efficiency, activity],
-                theta=['Accuracy', 'Survivability', 'Efficiency', 'Activity'],
-                fill='toself',
-                name=group_name,
-                line_color='red',
-                fillcolor='rgba(255, 0, 0, 0.3)'
-            ))
-            
-            # Add group details to title
-            total_pilots = group_data.get('total_pilots', 0)
-            total_kills = group_data.get('total_kills', 0)
-            
-            fig.update_layout(
-                polar=dict(
-                    radialaxis=dict(
-                        visible=True,
-                        range=[0, 100]
-                    )),
-                title=f"{group_name} ({total_pilots} pilots, {total_kills} kills) - Red Formation",
-                showlegend=True,
-                height=400
-            )
-            
-            charts.append({
-                'group': group_name,
-                'coalition': 'red',
-                'pilots': total_pilots,
-                'kills': total_kills,
-                'chart': json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
-            })
-        
-        # Create charts for Blue coalition groups
-        for group_info in blue_groups:
-            group_name = group_info['name']
-            group_data = group_info['data']
-            
-            # Normalize metrics to 0-100 scale (same as pilot performance)
-            accuracy = group_data.get('group_accuracy', 0)
-            survivability = group_data.get('group_survivability', 0)
-            efficiency = group_data.get('average_pilot_efficiency', 0)
-            activity = min(group_data.get('total_shots', 0) * 5, 100)  # Scale activity
-            
-            fig = go.Figure()
-            
-            fig.add_trace(go.Scatterpolar(
-                r=[accuracy, survivability, efficiency, activity],
-                theta=['Accuracy', 'Survivability', 'Efficiency', 'Activity'],
-                fill='toself',
-                name=group_name,
-                line_color='blue',
-                fillcolor='rgba(0, 0, 255, 0.3)'
-            ))
-            
-            # Add group details to title
-            total_pilots = group_data.get('total_pilots', 0)
-            total_kills = group_data.get('total_kills', 0)
-            
-            fig.update_layout(
-                polar=dict(
-                    radialaxis=dict(
-                        visible=True,
-                        range=[0, 100]
-                    )),
-                title=f"{group_name} ({total_pilots} pilots, {total_kills} kills) - Blue Formation",
-                showlegend=True,
-                height=400
-            )
-            
-            charts.append({
-                'group': group_name,
-                'coalition': 'blue',
-                'pilots': total_pilots,
-                'kills': total_kills,
-                'chart': json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
-            })
+            for group_info in coalition_groups:
+                group_name = group_info['name']
+                group_data = group_info['data']
+                
+                # Normalize metrics to 0-100 scale (same as pilot performance)
+                accuracy = group_data.get('group_accuracy', 0)
+                survivability = group_data.get('group_survivability', 0)
+                efficiency = group_info['efficiency']
+                activity = min(group_data.get('total_shots', 0) * 5, 100)  # Scale activity
+                
+                # Add group details to title
+                total_pilots = group_data.get('total_pilots', 0)
+                total_kills = group_data.get('total_kills', 0)
+                
+                title = f"{group_name} ({total_pilots} pilots, {total_kills} kills) - {label} Formation"
+                fig = self._make_radar(group_name, [accuracy, survivability, efficiency, activity],
+                                       color, fill, title, theta=self.GROUP_RADAR_AXES)
+                
+                charts.append({
+                    'group': group_name,
+                    'coalition': color,
+                    'pilots': total_pilots,
+                    'kills': total_kills,
+                    'chart': _plotly_dumps(fig)
+                })
         
         return charts
     
@@ -889,165 +1030,188 @@ class MissionAnalyzer:
         # Since we don't have direct access to all events, we'll create a timeline
         # based on the data we have and simulate a comprehensive view
         
-        events = []
+        # Events are bucketed by track as they are created, so the tracks need no
+        # later filtering pass
+        tracks = defaultdict(list)
+        
+        def add_event(event):
+            tracks[event.track].append(event)
         
         # Add mission start
-        events.append({
-            'time': 0,
-            'event_type': 'Mission Start',
-            'pilot': 'SYSTEM',
-            'aircraft': '',
-            'coalition': 0,
-            'details': 'Mission begins',
-            'track': 'System',
-            'priority': 1,
-            'color': 'green'
-        })
+        add_event(TimelineEvent(
+            time=0,
+            event_type='Mission Start',
+            pilot='SYSTEM',
+            aircraft='',
+            coalition=0,
+            details='Mission begins',
+            track='System',
+            priority=1,
+            color='green'
+        ))
+        
+        # Phase boundaries are tracked while the events are built, so no later scan is needed
+        mission_first_shot = None
+        combat_end = None
         
         # Process pilot data to extract timeline events
         for pilot_name, pilot_data in pilots.items():
             coalition = pilot_data.get('coalition', 0)
             aircraft = pilot_data.get('aircraft_type', 'Unknown')
-            coalition_color = 'red' if coalition == 1 else 'blue' if coalition == 2 else 'gray'
+            coalition_color = COALITION_COLORS.get(coalition, 'gray')
+            
+            # Look up the timing fields once per pilot
+            time_to_first_shot = pilot_data.get('time_to_first_shot')
+            time_to_first_kill = pilot_data.get('time_to_first_kill')
+            flight_time = pilot_data.get('flight_time')
+            killed_by = pilot_data.get('killed_by')
+            # Deaths and ejections are placed at the end of the flight when its length is known
+            end_of_flight = flight_time if flight_time is not None else 300
             
             # Engine startup / Mission entry (estimated)
-            if pilot_data.get('flight_time', 0) > 0:
-                events.append({
-                    'time': max(0, pilot_data.get('time_to_first_shot', 60) - 30),  # Estimate 30s before first shot
-                    'event_type': 'Engine Startup',
-                    'pilot': pilot_name,
-                    'aircraft': aircraft,
-                    'coalition': coalition,
-                    'details': f'{pilot_name} starts engines',
-                    'track': 'Flight Operations',
-                    'priority': 2,
-                    'color': coalition_color
-                })
+            if flight_time is not None and flight_time > 0:
+                startup_ref = time_to_first_shot if time_to_first_shot is not None else 60
+                add_event(TimelineEvent(
+                    time=max(0, startup_ref - 30),  # Estimate 30s before first shot
+                    event_type='Engine Startup',
+                    pilot=pilot_name,
+                    aircraft=aircraft,
+                    coalition=coalition,
+                    details=f'{pilot_name} starts engines',
+                    track='Flight Operations',
+                    priority=2,
+                    color=coalition_color
+                ))
             
             # First shot events
-            if pilot_data.get('time_to_first_shot') is not None:
-                events.append({
-                    'time': pilot_data.get('time_to_first_shot', 0),
-                    'event_type': 'First Shot',
-                    'pilot': pilot_name,
-                    'aircraft': aircraft,
-                    'coalition': coalition,
-                    'details': f'{pilot_name} fires first weapon',
-                    'track': 'Combat Actions',
-                    'priority': 3,
-                    'color': coalition_color
-                })
+            if time_to_first_shot is not None:
+                if mission_first_shot is None or time_to_first_shot < mission_first_shot:
+                    mission_first_shot = time_to_first_shot
+                add_event(TimelineEvent(
+                    time=time_to_first_shot,
+                    event_type='First Shot',
+                    pilot=pilot_name,
+                    aircraft=aircraft,
+                    coalition=coalition,
+                    details=f'{pilot_name} fires first weapon',
+                    track='Combat Actions',
+                    priority=3,
+                    color=coalition_color
+                ))
             
             # First kill events
-            if pilot_data.get('time_to_first_kill') is not None:
-                events.append({
-                    'time': pilot_data.get('time_to_first_kill', 0),
-                    'event_type': 'First Kill',
-                    'pilot': pilot_name,
-                    'aircraft': aircraft,
-                    'coalition': coalition,
-                    'details': f'{pilot_name} scores first kill',
-                    'track': 'Combat Results',
-                    'priority': 4,
-                    'color': coalition_color
-                })
+            if time_to_first_kill is not None:
+                combat_end = time_to_first_kill if combat_end is None else max(combat_end, time_to_first_kill)
+                add_event(TimelineEvent(
+                    time=time_to_first_kill,
+                    event_type='First Kill',
+                    pilot=pilot_name,
+                    aircraft=aircraft,
+                    coalition=coalition,
+                    details=f'{pilot_name} scores first kill',
+                    track='Combat Results',
+                    priority=4,
+                    color=coalition_color
+                ))
             
             # Death events
             if pilot_data.get('deaths', 0) > 0:
                 # Estimate death time based on other events or flight time
-                death_time = pilot_data.get('flight_time', 300)  # Default to end of flight
-                if pilot_data.get('killed_by'):
+                death_time = end_of_flight  # Default to end of flight
+                if killed_by:
                     # If we know who killed them, try to estimate when
-                    killer_data = pilots.get(pilot_data['killed_by'], {})
+                    killer_data = pilots.get(killed_by, {})
                     if killer_data.get('time_to_first_kill'):
                         death_time = killer_data['time_to_first_kill']
                 
-                events.append({
-                    'time': death_time,
-                    'event_type': 'Pilot Death',
-                    'pilot': pilot_name,
-                    'aircraft': aircraft,
-                    'coalition': coalition,
-                    'details': f'{pilot_name} KIA' + (f' by {pilot_data.get("killed_by", "unknown")}' if pilot_data.get('killed_by') else ''),
-                    'track': 'Casualties',
-                    'priority': 5,
-                    'color': 'darkred'
-                })
+                combat_end = death_time if combat_end is None else max(combat_end, death_time)
+                add_event(TimelineEvent(
+                    time=death_time,
+                    event_type='Pilot Death',
+                    pilot=pilot_name,
+                    aircraft=aircraft,
+                    coalition=coalition,
+                    details=f'{pilot_name} KIA' + (f' by {killed_by}' if killed_by else ''),
+                    track='Casualties',
+                    priority=5,
+                    color='darkred'
+                ))
             
             # Ejection events (estimated based on deaths)
             if pilot_data.get('ejections', 0) > 0:
-                eject_time = pilot_data.get('flight_time', 300) - 5  # 5 seconds before death/crash
-                events.append({
-                    'time': max(0, eject_time),
-                    'event_type': 'Ejection',
-                    'pilot': pilot_name,
-                    'aircraft': aircraft,
-                    'coalition': coalition,
-                    'details': f'{pilot_name} ejects from {aircraft}',
-                    'track': 'Flight Operations',
-                    'priority': 4,
-                    'color': 'orange'
-                })
+                eject_time = end_of_flight - 5  # 5 seconds before death/crash
+                add_event(TimelineEvent(
+                    time=max(0, eject_time),
+                    event_type='Ejection',
+                    pilot=pilot_name,
+                    aircraft=aircraft,
+                    coalition=coalition,
+                    details=f'{pilot_name} ejects from {aircraft}',
+                    track='Flight Operations',
+                    priority=4,
+                    color='orange'
+                ))
             
             # Add weapon usage events (spread throughout engagement)
             weapons_used = pilot_data.get('weapons_used', {})
             shots_fired = pilot_data.get('shots_fired', 0)
             
-            if shots_fired > 0 and pilot_data.get('time_to_first_shot') is not None:
-                first_shot_time = pilot_data['time_to_first_shot']
-                flight_time = pilot_data.get('flight_time', first_shot_time + 60)
+            if shots_fired > 0 and time_to_first_shot is not None:
+                engagement_end = flight_time if flight_time is not None else time_to_first_shot + 60
+                engagement_window = engagement_end - time_to_first_shot
                 
                 # Distribute weapon usage over time
                 for weapon, count in weapons_used.items():
                     if count > 0:
                         # Spread weapon usage over the engagement period
+                        step = engagement_window / count
                         for i in range(min(count, 3)):  # Show up to 3 weapon events per type
-                            weapon_time = first_shot_time + (i * (flight_time - first_shot_time) / max(count, 1))
-                            events.append({
-                                'time': weapon_time,
-                                'event_type': 'Weapon Fire',
-                                'pilot': pilot_name,
-                                'aircraft': aircraft,
-                                'coalition': coalition,
-                                'details': f'{pilot_name} fires {weapon}',
-                                'track': 'Weapons',
-                                'priority': 2,
-                                'color': coalition_color,
-                                'weapon': weapon
-                            })
+                            weapon_time = time_to_first_shot + i * step
+                            combat_end = weapon_time if combat_end is None else max(combat_end, weapon_time)
+                            add_event(TimelineEvent(
+                                time=weapon_time,
+                                event_type='Weapon Fire',
+                                pilot=pilot_name,
+                                aircraft=aircraft,
+                                coalition=coalition,
+                                details=f'{pilot_name} fires {weapon}',
+                                track='Weapons',
+                                priority=2,
+                                color=coalition_color,
+                                weapon=weapon
+                            ))
         
         # Add mission end
         mission_duration = data.get('mission_summary', {}).get('duration', 600)
-        events.append({
-            'time': mission_duration,
-            'event_type': 'Mission End',
-            'pilot': 'SYSTEM',
-            'aircraft': '',
-            'coalition': 0,
-            'details': 'Mission complete',
-            'track': 'System',
-            'priority': 1,
-            'color': 'green'
-        })
-        
-        if not events:
-            fig = go.Figure()
-            fig.add_annotation(text="No timeline data available", 
-                             xref="paper", yref="paper",
-                             x=0.5, y=0.5, showarrow=False)
-            return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+        add_event(TimelineEvent(
+            time=mission_duration,
+            event_type='Mission End',
+            pilot='SYSTEM',
+            aircraft='',
+            coalition=0,
+            details='Mission complete',
+            track='System',
+            priority=1,
+            color='green'
+        ))
         
-        # Sort events by time
-        events.sort(key=lambda x: x['time'])
+        if not tracks:
+            return _static_chart('combat_timeline_empty', lambda: _figure_spec([], {
+                'annotations': [{'text': "No timeline data available",
+                                 'xref': "paper", 'yref': "paper",
+                                 'x': 0.5, 'y': 0.5, 'showarrow': False}]
+            }))
         
-        # Create comprehensive timeline with multiple tracks
-        fig = make_subplots(
+        # Create comprehensive timeline with multiple tracks as raw trace dicts
+        layout, cells = _subplot_spec(
+            'combat_timeline',
             rows=5, cols=1,
             subplot_titles=('System Events', 'Flight Operations', 'Combat Actions', 'Weapons Usage', 'Combat Results & Casualties'),
             shared_xaxes=True,
             vertical_spacing=0.08,
             row_heights=[0.15, 0.2, 0.25, 0.2, 0.2]
         )
+        traces = []
         
         # Define track mapping
         track_rows = {
@@ -1059,71 +1223,60 @@ class MissionAnalyzer:
             'Casualties': 5
         }
         
-        # Group events by track
-        tracks = {}
-        for event in events:
-            track = event['track']
-            if track not in tracks:
-                tracks[track] = []
-            tracks[track].append(event)
-        
-        # Create timeline for each track
-        for track_name, track_events in tracks.items():
-            if track_name not in track_rows:
+        # Create timeline for each track, top row first
+        for track_name, row in track_rows.items():
+            track_events = tracks.get(track_name)
+            if not track_events:
                 continue
-                
-            row = track_rows[track_name]
-            
-            # Separate events by coalition for better visualization
-            red_events = [e for e in track_events if e['coalition'] == 1]
-            blue_events = [e for e in track_events if e['coalition'] == 2]
-            system_events = [e for e in track_events if e['coalition'] == 0]
-            
-            # Plot Red coalition events
-            if red_events:
-                fig.add_trace(go.Scatter(
-                    x=[e['time'] for e in red_events],
-                    y=[f"{e['pilot']} ({e['aircraft']})" if e['aircraft'] else e['pilot'] for e in red_events],
-                    mode='markers+text',
-                    text=[e['event_type'] for e in red_events],
-                    textposition="top center",
-                    marker=dict(
-                        size=12,
-                        color='red',
-                        symbol=[self._get_event_symbol(e['event_type']) for e in red_events],
-                        line=dict(width=2, color='white')
-                    ),
-                    name="Red Coalition",
-                    hovertemplate="<b>%{text}</b><br>Time: %{x:.1f}s<br>%{y}<br><extra></extra>",
-                    showlegend=(row == 1)  # Only show legend on first row
-                ), row=row, col=1)
-            
-            # Plot Blue coalition events
-            if blue_events:
-                fig.add_trace(go.Scatter(
-                    x=[e['time'] for e in blue_events],
-                    y=[f"{e['pilot']} ({e['aircraft']})" if e['aircraft'] else e['pilot'] for e in blue_events],
-                    mode='markers+text',
-                    text=[e['event_type'] for e in blue_events],
-                    textposition="top center",
+            track_events.sort(key=attrgetter('time'))
+            
+            # Separate events by coalition for better visualization (single pass)
+            red_events, blue_events, system_events = [], [], []
+            coalition_events = {1: red_events, 2: blue_events, 0: system_events}
+            for e in track_events:
+                bucket = coalition_events.get(e.coalition)
+                if bucket is not None:
+                    bucket.append(e)
+            
+            # Busy tracks draw WebGL markers with hover-only labels; per-point SVG
+            # text labels are what makes large timelines slow to render
+            high_volume = track_name in self.HIGH_VOLUME_TRACKS
+            
+            # Plot Red and Blue coalition events
+            for coalition_events, color, name in ((red_events, 'red', "Red Coalition"),
+                                                  (blue_events, 'blue', "Blue Coalition")):
+                if not coalition_events:
+                    continue
+                labels = [e.event_type for e in coalition_events]
+                if high_volume:
+                    label_args = dict(type='scattergl', mode='markers', hovertext=labels,
+                                      hovertemplate="<b>%{hovertext}</b><br>Time: %{x:.1f}s<br>%{y}<br><extra></extra>")
+                else:
+                    label_args = dict(type='scatter', mode='markers+text', text=labels, textposition="top center",
+                                      hovertemplate="<b>%{text}</b><br>Time: %{x:.1f}s<br>%{y}<br><extra></extra>")
+                traces.append(dict(
+                    **cells[row, 1],
+                    x=[e.time for e in coalition_events],
+                    y=[f"{e.pilot} ({e.aircraft})" if e.aircraft else e.pilot for e in coalition_events],
                     marker=dict(
                         size=12,
-                        color='blue',
-                        symbol=[self._get_event_symbol(e['event_type']) for e in blue_events],
+                        color=color,
+                        symbol=[self.EVENT_SYMBOLS.get(e.event_type, 'circle') for e in coalition_events],
                         line=dict(width=2, color='white')
                     ),
-                    name="Blue Coalition",
-                    hovertemplate="<b>%{text}</b><br>Time: %{x:.1f}s<br>%{y}<br><extra></extra>",
-                    showlegend=(row == 1)  # Only show legend on first row
-                ), row=row, col=1)
+                    name=name,
+                    showlegend=(row == 1),  # Only show legend on first row
+                    **label_args
+                ))
             
             # Plot System events
             if system_events:
-                fig.add_trace(go.Scatter(
-                    x=[e['time'] for e in system_events],
-                    y=[e['pilot'] for e in system_events],
+                traces.append(dict(
+                    type='scatter', **cells[row, 1],
+                    x=[e.time for e in system_events],
+                    y=[e.pilot for e in system_events],
                     mode='markers+text',
-                    text=[e['event_type'] for e in system_events],
+                    text=[e.event_type for e in system_events],
                     textposition="top center",
                     marker=dict(
                         size=15,
@@ -1134,21 +1287,33 @@ class MissionAnalyzer:
                     name="System Events",
                     hovertemplate="<b>%{text}</b><br>Time: %{x:.1f}s<br><extra></extra>",
                     showlegend=(row == 1)  # Only show legend on first row
-                ), row=row, col=1)
-        
-        # Add phase indicators
-        phases = self._get_mission_phases(events, mission_duration)
+                ))
+        
+        # Add phase indicators: a shaded band and a top-left label in every row
+        # holding events, as fig.add_vrect() draws them across non-empty subplots
+        phases = self._get_mission_phases(mission_first_shot, combat_end, mission_duration)
+        used_axes = {trace['xaxis'] for trace in traces}
+        phase_refs = [(cells[row, 1]['xaxis'], cells[row, 1]['yaxis'] + ' domain')
+                      for row in range(1, 6) if cells[row, 1]['xaxis'] in used_axes]
+        shapes = layout.setdefault('shapes', [])
+        annotations = layout.setdefault('annotations', [])
         for phase in phases:
-            fig.add_vrect(
-                x0=phase['start'], x1=phase['end'],
-                fillcolor=phase['color'], opacity=0.1,
-                layer="below", line_width=0,
-                annotation_text=phase['name'],
-                annotation_position="top left"
-            )
+            for xref, yref in phase_refs:
+                shapes.append({
+                    'type': 'rect', 'xref': xref, 'yref': yref,
+                    'x0': phase['start'], 'x1': phase['end'], 'y0': 0, 'y1': 1,
+                    'fillcolor': phase['color'], 'opacity': 0.1,
+                    'layer': "below", 'line': {'width': 0}
+                })
+            for xref, yref in phase_refs:
+                annotations.append({
+                    'text': phase['name'], 'showarrow': False,
+                    'xref': xref, 'yref': yref, 'x': phase['start'], 'y': 1,
+                    'xanchor': 'left', 'yanchor': 'top'
+                })
         
         # Update layout
-        fig.update_layout(
+        layout.update(
             title={
                 'text': "Comprehensive Combat Timeline - Multi-Track Event Analysis",
                 'x': 0.5,
@@ -1167,33 +1332,20 @@ class MissionAnalyzer:
         )
         
         # Update x-axes
-        fig.update_xaxes(title_text="Mission Time (seconds)", row=5, col=1)
+        _cell_axis(layout, cells[5, 1], 'x')['title'] = {'text': "Mission Time (seconds)"}
         for i in range(1, 6):
-            fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='lightgray', row=i, col=1)
-            fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='lightgray', row=i, col=1)
+            for axis in ('x', 'y'):
+                _cell_axis(layout, cells[i, 1], axis).update(showgrid=True, gridwidth=1, gridcolor='lightgray')
         
-        return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
-    
-    def _get_event_symbol(self, event_type):
-        """Get appropriate symbol for event type"""
-        symbol_map = {
-            'Engine Startup': 'circle',
-            'First Shot': 'triangle-up',
-            'First Kill': 'star',
-            'Pilot Death': 'x',
-            'Ejection': 'diamond',
-            'Weapon Fire': 'square',
-            'Mission Start': 'star',
-            'Mission End': 'star'
-        }
-        return symbol_map.get(event_type, 'circle')
+        return _plotly_dumps({'data': traces, 'layout': layout})
     
-    def _get_mission_phases(self, events, duration):
-        """Define mission phases based on events"""
+    def _get_mission_phases(self, first_shot_time, combat_end, duration):
+        """Define mission phases from the first shot and the last combat event (None when absent)"""
         phases = []
         
         # Pre-combat phase (0 to first shot)
-        first_shot_time = min([e['time'] for e in events if e['event_type'] == 'First Shot'], default=duration/4)
+        if first_shot_time is None:
+            first_shot_time = duration/4
         if first_shot_time > 0:
             phases.append({
                 'name': 'Pre-Combat',
@@ -1203,10 +1355,8 @@ class MissionAnalyzer:
             })
         
         # Combat phase (first shot to last kill/death)
-        combat_events = [e for e in events if e['event_type'] in ['First Kill', 'Pilot Death', 'Weapon Fire']]
-        if combat_events:
+        if combat_end is not None:
             combat_start = first_shot_time
-            combat_end = max([e['time'] for e in combat_events], default=duration*0.8)
             phases.append({
                 'name': 'Active Combat',
                 'start': combat_start,
@@ -1225,6 +1375,15 @@ class MissionAnalyzer:
         
         return phases
     
+    def _ring_layout(self, entities, radius, jitter):
+        """Spread entities evenly around a circle, jittering each position by up to +/- jitter"""
+        import numpy as np
+        n = len(entities)
+        angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+        xs = radius * np.cos(angles) + np.random.uniform(-jitter, jitter, n)
+        ys = radius * np.sin(angles) + np.random.uniform(-jitter, jitter, n)
+        return zip(entities, zip(xs.tolist(), ys.tolist()))
+    
     def create_kill_death_network(self, data):
         """Create comprehensive kill/death relationship network visualization including ground units"""
         pilots = data.get('pilots', {})
@@ -1269,42 +1428,38 @@ class MissionAnalyzer:
         
         if not all_relationships:
             # Create visually appealing empty state
-            fig = go.Figure()
-            fig.add_annotation(
-                text="<b>No Kill Relationships Found</b><br><br>" +
-                     "<span style='color: #666;'>This mission shows:</span><br>" +
-                     "🎯 No pilot-to-pilot engagements<br>" +
-                     "🏗️ No ground targets destroyed<br>" +
-                     "✈️ Deaths from crashes or system failures<br>" +
-                     "📊 Limited combat engagement data",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, 
-                showarrow=False,
-                font=dict(size=18, color='#2d3748'),
-                align="center",
-                bgcolor="rgba(255,255,255,0.95)",
-                bordercolor="#e2e8f0",
-                borderwidth=2,
-                borderpad=20
-            )
-            fig.update_layout(
-                title={
+            return _static_chart('kill_death_network_empty', lambda: _figure_spec([], {
+                'annotations': [{
+                    'text': "<b>No Kill Relationships Found</b><br><br>" +
+                            "<span style='color: #666;'>This mission shows:</span><br>" +
+                            "🎯 No pilot-to-pilot engagements<br>" +
+                            "🏗️ No ground targets destroyed<br>" +
+                            "✈️ Deaths from crashes or system failures<br>" +
+                            "📊 Limited combat engagement data",
+                    'xref': "paper", 'yref': "paper",
+                    'x': 0.5, 'y': 0.5,
+                    'showarrow': False,
+                    'font': {'size': 18, 'color': '#2d3748'},
+                    'align': "center",
+                    'bgcolor': "rgba(255,255,255,0.95)",
+                    'bordercolor': "#e2e8f0",
+                    'borderwidth': 2,
+                    'borderpad': 20
+                }],
+                'title': {
                     'text': "<b>Kill/Death Network Analysis</b>",
                     'x': 0.5,
                     'font': {'size': 24, 'color': '#1a202c'}
                 },
-                xaxis=dict(visible=False),
-                yaxis=dict(visible=False),
-                height=500,
-                plot_bgcolor='rgba(247,250,252,0.8)',
-                paper_bgcolor='linear-gradient(135deg, #667eea 0%, #764ba2 100%)',
-                margin=dict(t=80, b=40, l=40, r=40)
-            )
-            return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+                'xaxis': {'visible': False},
+                'yaxis': {'visible': False},
+                'height': 500,
+                'plot_bgcolor': 'rgba(247,250,252,0.8)',
+                'paper_bgcolor': 'white',
+                'margin': {'t': 80, 'b': 40, 'l': 40, 'r': 40}
+            }))
         
         # Create network layout using a force-directed approach
-        import math
-        import random
         
         # Separate pilots from ground units for positioning
         pilot_entities = [entity for entity in all_entities if entity in pilots]
@@ -1315,35 +1470,29 @@ class MissionAnalyzer:
         
         # Position pilots in the center area
         n_pilots = len(pilot_entities)
-        if n_pilots > 0:
-            if n_pilots == 1:
-                entity_positions[pilot_entities[0]] = (0, 0)
-            else:
-                for i, pilot in enumerate(pilot_entities):
-                    angle = 2 * math.pi * i / n_pilots
-                    radius = max(1, n_pilots / 6)  # Smaller radius for pilots
-                    x = radius * math.cos(angle) + random.uniform(-0.2, 0.2)
-                    y = radius * math.sin(angle) + random.uniform(-0.2, 0.2)
-                    entity_positions[pilot] = (x, y)
+        if n_pilots == 1:
+            entity_positions[pilot_entities[0]] = (0, 0)
+        elif n_pilots > 1:
+            radius = max(1, n_pilots / 6)  # Smaller radius for pilots
+            entity_positions.update(self._ring_layout(pilot_entities, radius, 0.2))
         
         # Position ground units in an outer ring
-        n_ground = len(ground_entities)
-        if n_ground > 0:
+        if ground_entities:
             outer_radius = max(2, n_pilots / 4 + 1.5)  # Outer ring for ground units
-            for i, ground_unit in enumerate(ground_entities):
-                angle = 2 * math.pi * i / n_ground
-                x = outer_radius * math.cos(angle) + random.uniform(-0.3, 0.3)
-                y = outer_radius * math.sin(angle) + random.uniform(-0.3, 0.3)
-                entity_positions[ground_unit] = (x, y)
+            entity_positions.update(self._ring_layout(ground_entities, outer_radius, 0.3))
         
-        # Create the network visualization
-        fig = go.Figure()
+        # Create the network visualization as raw trace and annotation dicts
+        traces = []
+        annotations = []
         
         # Add edges (kill relationships) first so they appear behind nodes
-        pilot_edge_x = []
-        pilot_edge_y = []
-        ground_edge_x = []
-        ground_edge_y = []
+        # Each edge is a (start, end, NaN line break) row in preallocated arrays
+        import numpy as np
+        pilot_edge_x = np.full((len(pilot_to_pilot_relationships), 3), np.nan)
+        pilot_edge_y = np.full_like(pilot_edge_x, np.nan)
+        ground_edge_x = np.full((len(pilot_to_ground_relationships), 3), np.nan)
+        ground_edge_y = np.full_like(ground_edge_x, np.nan)
+        n_pilot_edges = n_ground_edges = 0
         
         for rel in all_relationships:
             killer = rel['killer']
@@ -1355,53 +1504,20 @@ class MissionAnalyzer:
                 
                 if rel['relationship_type'] == 'pilot_to_pilot':
                     # Add pilot-to-pilot edge coordinates
-                    pilot_edge_x.extend([x0, x1, None])
-                    pilot_edge_y.extend([y0, y1, None])
-                    
-                    # Add enhanced arrow annotation for direction
-                    fig.add_annotation(
-                        x=(x0 + x1) / 2,
-                        y=(y0 + y1) / 2,
-                        ax=x0, ay=y0,
-                        axref='x', ayref='y',
-                        xref='x', yref='y',
-                        showarrow=True,
-                        arrowhead=3,
-                        arrowsize=2,
-                        arrowwidth=3,
-                        arrowcolor='#dc2626',
-                        text="",
-                        bgcolor="rgba(255,255,255,0.95)",
-                        bordercolor="#dc2626",
-                        borderwidth=2
-                    )
+                    pilot_edge_x[n_pilot_edges, :2] = (x0, x1)
+                    pilot_edge_y[n_pilot_edges, :2] = (y0, y1)
+                    n_pilot_edges += 1
                 else:  # pilot_to_ground
                     # Add pilot-to-ground edge coordinates
-                    ground_edge_x.extend([x0, x1, None])
-                    ground_edge_y.extend([y0, y1, None])
-                    
-                    # Add enhanced arrow annotation for ground kills
-                    fig.add_annotation(
-                        x=(x0 + x1) / 2,
-                        y=(y0 + y1) / 2,
-                        ax=x0, ay=y0,
-                        axref='x', ayref='y',
-                        xref='x', yref='y',
-                        showarrow=True,
-                        arrowhead=2,
-                        arrowsize=1.5,
-                        arrowwidth=2,
-                        arrowcolor='#f59e0b',
-                        text="",
-                        bgcolor="rgba(255,255,255,0.9)",
-                        bordercolor="#f59e0b",
-                        borderwidth=1
-                    )
+                    ground_edge_x[n_ground_edges, :2] = (x0, x1)
+                    ground_edge_y[n_ground_edges, :2] = (y0, y1)
+                    n_ground_edges += 1
         
         # Add pilot-to-pilot edges with enhanced styling
-        if pilot_edge_x:
-            fig.add_trace(go.Scatter(
-                x=pilot_edge_x, y=pilot_edge_y,
+        if n_pilot_edges:
+            traces.append(dict(
+                type='scatter',
+                x=pilot_edge_x[:n_pilot_edges].ravel(), y=pilot_edge_y[:n_pilot_edges].ravel(),
                 mode='lines',
                 line=dict(width=4, color='#dc2626', dash='solid'),
                 hoverinfo='none',
@@ -1410,9 +1526,10 @@ class MissionAnalyzer:
             ))
         
         # Add pilot-to-ground edges with enhanced styling
-        if ground_edge_x:
-            fig.add_trace(go.Scatter(
-                x=ground_edge_x, y=ground_edge_y,
+        if n_ground_edges:
+            traces.append(dict(
+                type='scatter',
+                x=ground_edge_x[:n_ground_edges].ravel(), y=ground_edge_y[:n_ground_edges].ravel(),
                 mode='lines',
                 line=dict(width=3, color='#f59e0b', dash='dash'),
                 hoverinfo='none',
@@ -1420,12 +1537,35 @@ class MissionAnalyzer:
                 name='🏗️ Ground Unit Kills'
             ))
         
+        # Kill direction arrowheads at the edge midpoints: one marker trace per edge
+        # kind rather than an arrow annotation per kill, which plotly.js lays out
+        # one by one as separate SVG elements
+        for edge_x, edge_y, n_edges, color, size in (
+            (pilot_edge_x, pilot_edge_y, n_pilot_edges, '#dc2626', 16),
+            (ground_edge_x, ground_edge_y, n_ground_edges, '#f59e0b', 12),
+        ):
+            if n_edges:
+                (x0, x1), (y0, y1) = edge_x[:n_edges, :2].T, edge_y[:n_edges, :2].T
+                traces.append(dict(
+                    type='scatter',
+                    x=(x0 + x1) / 2, y=(y0 + y1) / 2,
+                    mode='markers',
+                    # The arrow symbol points up; marker angles turn it clockwise
+                    marker=dict(symbol='arrow', angle=np.degrees(np.arctan2(x1 - x0, y1 - y0)),
+                                size=size, color=color, line=dict(width=1, color='white')),
+                    hoverinfo='none',
+                    showlegend=False
+                ))
+        
         # Separate pilots by coalition and role
         red_pilots = []
         blue_pilots = []
         neutral_pilots = []
-        killers = set([r['killer'] for r in all_relationships])
-        victims = set([r['victim'] for r in all_relationships])
+        killers = set()
+        victims = set()
+        for r in all_relationships:
+            killers.add(r['killer'])
+            victims.add(r['victim'])
         
         for pilot in pilot_entities:
             pilot_data = pilots.get(pilot, {})
@@ -1521,9 +1661,11 @@ class MissionAnalyzer:
                 )
                 hover_texts.append(hover_text)
             
-            fig.add_trace(go.Scatter(
-                x=[p['x'] for p in coalition_pilots],
-                y=[p['y'] for p in coalition_pilots],
+            xs, ys, labels = map(list, zip(*map(itemgetter('x', 'y', 'name'), coalition_pilots)))
+            traces.append(dict(
+                type='scatter',
+                x=xs,
+                y=ys,
                 mode='markers+text',
                 marker=dict(
                     size=node_sizes,
@@ -1532,7 +1674,7 @@ class MissionAnalyzer:
                     line=dict(width=3, color='white'),
                     opacity=0.9
                 ),
-                text=[p['name'] for p in coalition_pilots],
+                text=labels,
                 textposition="bottom center",
                 textfont=dict(size=11, color='#1a202c', family='Arial Black'),
                 hovertemplate='%{hovertext}<extra></extra>',
@@ -1598,9 +1740,11 @@ class MissionAnalyzer:
                 )
                 hover_texts.append(hover_text)
             
-            fig.add_trace(go.Scatter(
-                x=[g['x'] for g in coalition_ground],
-                y=[g['y'] for g in coalition_ground],
+            xs, ys, labels = map(list, zip(*map(itemgetter('x', 'y', 'unit_type'), coalition_ground)))
+            traces.append(dict(
+                type='scatter',
+                x=xs,
+                y=ys,
                 mode='markers+text',
                 marker=dict(
                     size=16,
@@ -1609,7 +1753,7 @@ class MissionAnalyzer:
                     line=dict(width=2, color=color_scheme['border']),
                     opacity=0.8
                 ),
-                text=[g['unit_type'] for g in coalition_ground],
+                text=labels,
                 textposition="bottom center",
                 textfont=dict(size=9, color='#1a202c', family='Arial'),
                 hovertemplate='%{hovertext}<extra></extra>',
@@ -1624,7 +1768,7 @@ class MissionAnalyzer:
         total_entities = len(all_entities)
         
         summary_text = f"📊 Network Analysis: {pilot_relationships} pilot kill(s), {ground_relationships} ground kill(s) among {total_entities} entities"
-        fig.add_annotation(
+        annotations.append(dict(
             text=summary_text,
             xref="paper", yref="paper",
             x=0.5, y=0.97,
@@ -1634,35 +1778,21 @@ class MissionAnalyzer:
             bordercolor="#e2e8f0",
             borderwidth=2,
             borderpad=10
-        )
-        
-        # Add detailed relationship list with enhanced styling
-        rel_text = "<b>🔥 Kill Relationships:</b><br>"
-        rel_count = 0
-        
-        # Add pilot-to-pilot relationships
-        for rel in pilot_to_pilot_relationships:
-            if rel_count >= 8:  # Limit to avoid clutter
-                break
-            killer_aircraft = rel['killer_data'].get('aircraft_type', 'Unknown')
-            victim_aircraft = rel['victim_data'].get('aircraft_type', 'Unknown')
-            rel_text += f"🎯 {rel['killer']} ({killer_aircraft}) ➤ {rel['victim']} ({victim_aircraft})<br>"
-            rel_count += 1
-        
-        # Add pilot-to-ground relationships
-        for rel in pilot_to_ground_relationships:
-            if rel_count >= 8:  # Limit to avoid clutter
-                break
-            killer_aircraft = rel['killer_data'].get('aircraft_type', 'Unknown')
-            victim_type = rel['victim_data'].get('unit_type', 'Unknown')
-            weapon = rel.get('weapon', 'Unknown')
-            rel_text += f"🏗️ {rel['killer']} ({killer_aircraft}) ➤ {victim_type} [{weapon}]<br>"
-            rel_count += 1
+        ))
         
+        # Add detailed relationship list with enhanced styling (at most 8 lines to avoid clutter)
+        pilot_lines = (f"🎯 {rel['killer']} ({rel['killer_data'].get('aircraft_type', 'Unknown')}) ➤ "
+                       f"{rel['victim']} ({rel['victim_data'].get('aircraft_type', 'Unknown')})<br>"
+                       for rel in pilot_to_pilot_relationships)
+        ground_lines = (f"🏗️ {rel['killer']} ({rel['killer_data'].get('aircraft_type', 'Unknown')}) ➤ "
+                        f"{rel['victim_data'].get('unit_type', 'Unknown')} [{rel.get('weapon', 'Unknown')}]<br>"
+                        for rel in pilot_to_ground_relationships)
+        rel_lines = list(islice(chain(pilot_lines, ground_lines), 8))
         if len(all_relationships) > 8:
-            rel_text += f"<i>... and {len(all_relationships) - 8} more</i>"
+            rel_lines.append(f"<i>... and {len(all_relationships) - 8} more</i>")
+        rel_text = "<b>🔥 Kill Relationships:</b><br>" + ''.join(rel_lines)
         
-        fig.add_annotation(
+        annotations.append(dict(
             text=rel_text,
             xref="paper", yref="paper",
             x=0.02, y=0.98,
@@ -1674,10 +1804,14 @@ class MissionAnalyzer:
             borderpad=8,
             align="left",
             valign="top"
-        )
+        ))
+        
+        # Axis bounds of all node positions in one reduction
+        positions = np.array(list(entity_positions.values()), dtype=np.float64)
+        (x_min, y_min), (x_max, y_max) = positions.min(axis=0).tolist(), positions.max(axis=0).tolist()
         
         # Update layout with modern, appealing styling
-        fig.update_layout(
+        layout = dict(
             title={
                 'text': "<b>🌐 Kill/Death Network</b><br><span style='font-size:14px; color:#718096;'>Combat Relationship Analysis</span>",
                 'x': 0.5,
@@ -1685,13 +1819,11 @@ class MissionAnalyzer:
             },
             xaxis=dict(
                 visible=False,
-                range=[min([pos[0] for pos in entity_positions.values()]) - 1.5,
-                       max([pos[0] for pos in entity_positions.values()]) + 1.5]
+                range=[x_min - 1.5, x_max + 1.5]
             ),
             yaxis=dict(
                 visible=False,
-                range=[min([pos[1] for pos in entity_positions.values()]) - 1.5,
-                       max([pos[1] for pos in entity_positions.values()]) + 1.5],
+                range=[y_min - 1.5, y_max + 1.5],
                 scaleanchor="x",
                 scaleratio=1
             ),
@@ -1711,112 +1843,81 @@ class MissionAnalyzer:
                 font=dict(size=12, color='#2d3748')
             ),
             margin=dict(t=120, b=60, l=60, r=200),
-            font=dict(family='Arial', size=12, color='#2d3748')
+            font=dict(family='Arial', size=12, color='#2d3748'),
+            annotations=annotations
         )
         
-        return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+        return _plotly_dumps(_figure_spec(traces, layout))
     
     def create_efficiency_leaderboard(self, data):
         """Create efficiency leaderboard with star ratings"""
-        pilots = data.get('pilots', {})
-        
-        # Sort pilots by efficiency rating
-        pilot_rankings = sorted(pilots.items(), 
-                              key=lambda x: x[1].get('efficiency_rating', 0), 
-                              reverse=True)
-        
-        names = []
-        ratings = []
-        aircraft = []
-        colors = []
-        stars = []
-        
-        for pilot_name, pilot_data in pilot_rankings[:10]:  # Top 10
-            names.append(pilot_name)
-            rating = pilot_data.get('efficiency_rating', 0)
-            ratings.append(rating)
-            aircraft.append(pilot_data.get('aircraft_type', 'Unknown'))
-            
-            # Color based on coalition
-            coalition = pilot_data.get('coalition', 0)
-            colors.append('red' if coalition == 1 else 'blue')
-            
-            # Star rating
-            if rating >= 80:
-                stars.append('★★★★★')
-            elif rating >= 60:
-                stars.append('★★★★☆')
-            elif rating >= 40:
-                stars.append('★★★☆☆')
-            elif rating >= 20:
-                stars.append('★★☆☆☆')
-            else:
-                stars.append('★☆☆☆☆')
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            y=names,
-            x=ratings,
-            orientation='h',
-            marker_color=colors,
-            text=[f"{rating:.1f} {star}" for rating, star in zip(ratings, stars)],
-            textposition="inside"
-        ))
-        
-        fig.update_layout(
-            title="Pilot Efficiency Leaderboard",
-            xaxis_title="Efficiency Rating (0-100)",
-            yaxis_title="Pilot",
-            height=max(400, len(names) * 40)
+        import numpy as np
+        # Top 10 pilots by efficiency rating, as column arrays (stable, so ties keep log order)
+        top_pilots = self._pilot_frame(data).sort_values(
+            'efficiency_rating', ascending=False, kind='stable').head(10)
+        
+        names = top_pilots.index.tolist()
+        ratings = top_pilots['efficiency_rating'].tolist()
+        
+        # Color based on coalition, stars by 20-point rating tier
+        colors = np.where(top_pilots['coalition'].to_numpy() == 1, 'red', 'blue').tolist()
+        stars = np.take(self.STAR_RATINGS, np.digitize(ratings, self.STAR_TIERS))
+        
+        fig = _figure_spec(
+            [{
+                'type': 'bar',
+                'y': names,
+                'x': ratings,
+                'orientation': 'h',
+                'marker': {'color': colors},
+                'text': [f"{rating:.1f} {star}" for rating, star in zip(ratings, stars)],
+                'textposition': 'inside'
+            }],
+            {
+                'title': {'text': "Pilot Efficiency Leaderboard"},
+                'xaxis': {'title': {'text': "Efficiency Rating (0-100)"}},
+                'yaxis': {'title': {'text': "Pilot"}},
+                'height': max(400, len(names) * 40)
+            }
         )
         
-        return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+        return _plotly_dumps(fig)
 
     def create_air_to_ground_analysis(self, data):
         """Create comprehensive air-to-ground analysis dashboard"""
         pilots = data.get('pilots', {})
         
-        # Collect air-to-ground data
-        ag_pilots = []
+        # Collect the per-metric columns, weapon totals and response times in one pass
+        # over the pilots with A2G activity or ground kills
+        names, shots, hits, accuracy, kills, coalitions = [], [], [], [], [], []
+        all_weapons = Counter()
+        pilots_with_time = []
         for pilot_name, pilot_data in pilots.items():
             ag_shots = pilot_data.get('ag_shots_fired', 0)
-            ag_hits = pilot_data.get('ag_hits_scored', 0)
-            ag_accuracy = pilot_data.get('ag_accuracy', 0)
             ground_kills = len(pilot_data.get('ground_units_killed', []))
+            if not (ag_shots > 0 or ground_kills > 0):
+                continue
             
-            if ag_shots > 0 or ground_kills > 0:  # Include pilots with A2G activity or ground kills
-                ag_pilots.append({
-                    'name': pilot_name,
-                    'aircraft': pilot_data.get('aircraft_type', 'Unknown'),
-                    'coalition': pilot_data.get('coalition', 0),
-                    'shots': ag_shots,
-                    'hits': ag_hits,
-                    'accuracy': ag_accuracy,
-                    'ground_kills': ground_kills,
-                    'weapons': pilot_data.get('ag_weapons_used', {}),
-                    'time_to_first_ag': pilot_data.get('time_to_first_ag_shot', None)
-                })
-        
-        if not ag_pilots:
+            coalition = pilot_data.get('coalition', 0)
+            names.append(pilot_name)
+            shots.append(ag_shots)
+            hits.append(pilot_data.get('ag_hits_scored', 0))
+            accuracy.append(pilot_data.get('ag_accuracy', 0))
+            kills.append(ground_kills)
+            coalitions.append(coalition)
+            all_weapons.update(pilot_data.get('ag_weapons_used', {}))
+            time_to_first_ag = pilot_data.get('time_to_first_ag_shot', None)
+            if time_to_first_ag is not None:
+                pilots_with_time.append((pilot_name, time_to_first_ag, coalition))
+        
+        if not names:
             # No air-to-ground activity
-            fig = go.Figure()
-            fig.add_annotation(
-                text="No air-to-ground weapon activity detected in this mission",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, xanchor='center', yanchor='middle',
-                showarrow=False, font=dict(size=16)
-            )
-            fig.update_layout(
-                title="Air-to-Ground Analysis",
-                xaxis=dict(visible=False),
-                yaxis=dict(visible=False),
-                height=400
-            )
-            return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+            return _no_activity_chart('air_to_ground_analysis_empty', "No air-to-ground weapon activity detected in this mission",
+                                      "Air-to-Ground Analysis", 400)
         
         # Create dashboard with multiple subplots
-        fig = make_subplots(
+        layout, cells = _subplot_spec(
+            'air_to_ground_analysis',
             rows=2, cols=2,
             subplot_titles=(
                 'A2G Shots vs Accuracy', 'A2G Weapon Usage Distribution',
@@ -1825,173 +1926,137 @@ class MissionAnalyzer:
             specs=[[{"type": "scatter"}, {"type": "pie"}],
                    [{"type": "bar"}, {"type": "bar"}]]
         )
+        traces = []
+        
+        # Per-metric columns, shared by the scatter and the coalition totals below.
+        # 32-bit dtypes halve the base64 typed arrays Plotly emits for numpy data.
+        import numpy as np
+        names = np.array(names, dtype=object)
+        shots = np.array(shots, dtype=np.int32)
+        hits = np.array(hits, dtype=np.int32)
+        accuracy = np.array(accuracy, dtype=np.float32)
+        kills = np.array(kills, dtype=np.int32)
+        coalitions = np.array(coalitions)
+        red = coalitions == 1
+        blue = coalitions == 2
         
         # 1. Shots vs Accuracy scatter plot (with ground kills as marker size)
-        red_pilots = [p for p in ag_pilots if p['coalition'] == 1]
-        blue_pilots = [p for p in ag_pilots if p['coalition'] == 2]
-        
-        if red_pilots:
-            fig.add_trace(go.Scatter(
-                x=[p['shots'] for p in red_pilots],
-                y=[p['accuracy'] for p in red_pilots],
-                mode='markers+text',
-                text=[p['name'] for p in red_pilots],
-                textposition="top center",
-                marker=dict(
-                    size=[max(8, p['ground_kills'] * 3 + 8) for p in red_pilots],  # Size based on ground kills
-                    color='red', 
-                    symbol='circle',
-                    line=dict(width=1, color='darkred')
-                ),
-                name='Red Coalition',
-                hovertemplate='<b>%{text}</b><br>Shots: %{x}<br>Accuracy: %{y:.1f}%<br>Ground Kills: %{marker.size}<extra></extra>',
-                customdata=[p['ground_kills'] for p in red_pilots]
-            ), row=1, col=1)
-        
-        if blue_pilots:
-            fig.add_trace(go.Scatter(
-                x=[p['shots'] for p in blue_pilots],
-                y=[p['accuracy'] for p in blue_pilots],
-                mode='markers+text',
-                text=[p['name'] for p in blue_pilots],
-                textposition="top center",
-                marker=dict(
-                    size=[max(8, p['ground_kills'] * 3 + 8) for p in blue_pilots],  # Size based on ground kills
-                    color='blue', 
-                    symbol='circle',
-                    line=dict(width=1, color='darkblue')
-                ),
-                name='Blue Coalition',
-                hovertemplate='<b>%{text}</b><br>Shots: %{x}<br>Accuracy: %{y:.1f}%<br>Ground Kills: %{marker.size}<extra></extra>',
-                customdata=[p['ground_kills'] for p in blue_pilots]
-            ), row=1, col=1)
+        for mask, color, outline, name in ((red, 'red', 'darkred', 'Red Coalition'),
+                                           (blue, 'blue', 'darkblue', 'Blue Coalition')):
+            if mask.any():
+                traces.append({
+                    'type': 'scatter', **cells[1, 1],
+                    'x': _typed_array(shots[mask]),
+                    'y': _typed_array(accuracy[mask]),
+                    'mode': 'markers+text',
+                    'text': names[mask].tolist(),
+                    'textposition': "top center",
+                    'marker': {
+                        'size': _typed_array(np.maximum(8, kills[mask] * 3 + 8)),  # Size based on ground kills
+                        'color': color,
+                        'symbol': 'circle',
+                        'line': {'width': 1, 'color': outline}
+                    },
+                    'name': name,
+                    'hovertemplate': '<b>%{text}</b><br>Shots: %{x}<br>Accuracy: %{y:.1f}%<br>Ground Kills: %{marker.size}<extra></extra>',
+                    'customdata': _typed_array(kills[mask])
+                })
         
         # 2. Weapon usage pie chart
-        all_weapons = {}
-        for pilot in ag_pilots:
-            for weapon, count in pilot['weapons'].items():
-                all_weapons[weapon] = all_weapons.get(weapon, 0) + count
-        
         if all_weapons:
-            fig.add_trace(go.Pie(
-                labels=list(all_weapons.keys()),
-                values=list(all_weapons.values()),
-                hole=.3
-            ), row=1, col=2)
+            traces.append({
+                'type': 'pie', **cells[1, 2],
+                'labels': list(all_weapons.keys()),
+                'values': list(all_weapons.values()),
+                'hole': .3
+            })
         
         # 3. Coalition performance comparison (now includes kills)
-        red_total_shots = sum(p['shots'] for p in red_pilots)
-        blue_total_shots = sum(p['shots'] for p in blue_pilots)
-        red_total_hits = sum(p['hits'] for p in red_pilots)
-        blue_total_hits = sum(p['hits'] for p in blue_pilots)
-        red_total_kills = sum(p['ground_kills'] for p in red_pilots)
-        blue_total_kills = sum(p['ground_kills'] for p in blue_pilots)
-        
-        fig.add_trace(go.Bar(
-            x=['Red Coalition', 'Blue Coalition'],
-            y=[red_total_shots, blue_total_shots],
-            name='A2G Shots',
-            marker_color=['red', 'blue'],
-            opacity=0.5
-        ), row=2, col=1)
-        
-        fig.add_trace(go.Bar(
-            x=['Red Coalition', 'Blue Coalition'],
-            y=[red_total_hits, blue_total_hits],
-            name='A2G Hits',
-            marker_color=['darkred', 'darkblue'],
-            opacity=0.7
-        ), row=2, col=1)
-        
-        fig.add_trace(go.Bar(
-            x=['Red Coalition', 'Blue Coalition'],
-            y=[red_total_kills, blue_total_kills],
-            name='Ground Kills',
-            marker_color=['firebrick', 'navy']
-        ), row=2, col=1)
+        traces.append({
+            'type': 'bar', **cells[2, 1],
+            'x': ['Red Coalition', 'Blue Coalition'],
+            'y': [shots[red].sum(), shots[blue].sum()],
+            'name': 'A2G Shots',
+            'marker': {'color': ['red', 'blue']},
+            'opacity': 0.5
+        })
+        
+        traces.append({
+            'type': 'bar', **cells[2, 1],
+            'x': ['Red Coalition', 'Blue Coalition'],
+            'y': [hits[red].sum(), hits[blue].sum()],
+            'name': 'A2G Hits',
+            'marker': {'color': ['darkred', 'darkblue']},
+            'opacity': 0.7
+        })
+        
+        traces.append({
+            'type': 'bar', **cells[2, 1],
+            'x': ['Red Coalition', 'Blue Coalition'],
+            'y': [kills[red].sum(), kills[blue].sum()],
+            'name': 'Ground Kills',
+            'marker': {'color': ['firebrick', 'navy']}
+        })
         
         # 4. Response time (time to first A2G shot)
-        pilots_with_time = [p for p in ag_pilots if p['time_to_first_ag'] is not None]
         if pilots_with_time:
-            fig.add_trace(go.Bar(
-                x=[p['name'] for p in pilots_with_time[:10]],  # Top 10
-                y=[p['time_to_first_ag'] for p in pilots_with_time[:10]],
-                marker_color=['red' if p['coalition'] == 1 else 'blue' for p in pilots_with_time[:10]],
-                name='Time to First A2G Shot'
-            ), row=2, col=2)
-        
-        fig.update_layout(
-            title="Air-to-Ground Combat Analysis",
+            time_names, times, time_coalitions = zip(*pilots_with_time[:10])  # Top 10
+            traces.append({
+                'type': 'bar', **cells[2, 2],
+                'x': list(time_names),
+                'y': list(times),
+                'marker': {'color': [COALITION_COLORS.get(c, 'blue') for c in time_coalitions]},
+                'name': 'Time to First A2G Shot'
+            })
+        
+        layout.update(
+            title={'text': "Air-to-Ground Combat Analysis"},
             height=800,
             showlegend=True
         )
         
         # Update axis labels
-        fig.update_xaxes(title_text="A2G Shots Fired", row=1, col=1)
-        fig.update_yaxes(title_text="A2G Accuracy (%)", row=1, col=1)
-        fig.update_yaxes(title_text="Count", row=2, col=1)
-        fig.update_xaxes(title_text="Pilot", row=2, col=2)
-        fig.update_yaxes(title_text="Time (seconds)", row=2, col=2)
+        _cell_axis(layout, cells[1, 1], 'x')['title'] = {'text': "A2G Shots Fired"}
+        _cell_axis(layout, cells[1, 1], 'y')['title'] = {'text': "A2G Accuracy (%)"}
+        _cell_axis(layout, cells[2, 1], 'y')['title'] = {'text': "Count"}
+        _cell_axis(layout, cells[2, 2], 'x')['title'] = {'text': "Pilot"}
+        _cell_axis(layout, cells[2, 2], 'y')['title'] = {'text': "Time (seconds)"}
         
         # Add annotation for scatter plot
-        fig.add_annotation(
-            text="Marker size = Ground Kills",
-            xref="x", yref="y",
-            x=0.02, y=0.98,
-            xanchor='left', yanchor='top',
-            showarrow=False,
-            font=dict(size=10, color="gray"),
-            row=1, col=1
-        )
+        layout['annotations'].append({
+            'text': "Marker size = Ground Kills",
+            'xref': cells[1, 1]['xaxis'], 'yref': cells[1, 1]['yaxis'],
+            'x': 0.02, 'y': 0.98,
+            'xanchor': 'left', 'yanchor': 'top',
+            'showarrow': False,
+            'font': {'size': 10, 'color': "gray"}
+        })
         
-        return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+        return _plotly_dumps({'data': traces, 'layout': layout})
     
     def create_ag_pilot_dashboard(self, data):
         """Create air-to-ground statistics per pilot"""
         pilots = data.get('pilots', {})
         
-        # Collect and sort pilots by A2G activity
-        ag_pilots = []
-        for pilot_name, pilot_data in pilots.items():
-            ag_shots = pilot_data.get('ag_shots_fired', 0)
-            ag_hits = pilot_data.get('ag_hits_scored', 0)
-            ag_accuracy = pilot_data.get('ag_accuracy', 0)
-            ground_kills = len(pilot_data.get('ground_units_killed', []))
-            
-            ag_pilots.append({
-                'name': pilot_name,
-                'aircraft': pilot_data.get('aircraft_type', 'Unknown'),
-                'coalition': pilot_data.get('coalition', 0),
-                'shots': ag_shots,
-                'hits': ag_hits,
-                'accuracy': ag_accuracy,
-                'ground_kills': ground_kills,
-                'weapons': pilot_data.get('ag_weapons_used', {}),
-                'efficiency': pilot_data.get('efficiency_rating', 0)
-            })
-        
-        # Sort by total A2G activity (shots + ground kills)
-        ag_pilots.sort(key=lambda x: x['shots'] + x['ground_kills'], reverse=True)
-        
-        # Take top 15 pilots
-        top_pilots = ag_pilots[:15]
+        # Pick the 15 most active pilots (A2G shots + ground kills) before building
+        # their chart rows; nlargest keeps the order a stable descending sort gives
+        def ag_activity(item):
+            pilot_data = item[1]
+            return pilot_data.get('ag_shots_fired', 0) + len(pilot_data.get('ground_units_killed', []))
+        
+        top_pilots = [{
+            'name': pilot_name,
+            'coalition': pilot_data.get('coalition', 0),
+            'shots': pilot_data.get('ag_shots_fired', 0),
+            'hits': pilot_data.get('ag_hits_scored', 0),
+            'accuracy': pilot_data.get('ag_accuracy', 0),
+            'ground_kills': len(pilot_data.get('ground_units_killed', []))
+        } for pilot_name, pilot_data in heapq.nlargest(15, pilots.items(), key=ag_activity)]
         
         if not any(p['shots'] > 0 or p['ground_kills'] > 0 for p in top_pilots):
             # No air-to-ground activity
-            fig = go.Figure()
-            fig.add_annotation(
-                text="No air-to-ground weapon activity detected in this mission",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, xanchor='center', yanchor='middle',
-                showarrow=False, font=dict(size=16)
-            )
-            fig.update_layout(
-                title="Air-to-Ground Statistics per Pilot",
-                xaxis=dict(visible=False),
-                yaxis=dict(visible=False),
-                height=600
-            )
-            return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+            return _no_activity_chart('ag_pilot_dashboard_empty', "No air-to-ground weapon activity detected in this mission",
+                                      "Air-to-Ground Statistics per Pilot", 600)
         
         # Create grouped bar chart
         pilot_names = [p['name'] for p in top_pilots]
@@ -1999,59 +2064,68 @@ class MissionAnalyzer:
         ag_hits = [p['hits'] for p in top_pilots]
         ag_kills = [p['ground_kills'] for p in top_pilots]
         ag_accuracy = [p['accuracy'] for p in top_pilots]
-        colors = ['red' if p['coalition'] == 1 else 'blue' for p in top_pilots]
-        
-        fig = make_subplots(
+        # Coalition shades for each bar series, picked in one vectorized pass
+        import numpy as np
+        is_red = np.fromiter((p['coalition'] == 1 for p in top_pilots), dtype=bool, count=len(top_pilots))
+        colors = np.where(is_red, 'red', 'blue').tolist()
+        hit_colors = np.where(is_red, 'darkred', 'darkblue').tolist()
+        kill_colors = np.where(is_red, 'firebrick', 'navy').tolist()
+        
+        layout, cells = _subplot_spec(
+            'ag_pilot_dashboard',
             rows=2, cols=1,
             subplot_titles=('Air-to-Ground Shots, Hits, and Kills per Pilot', 'Air-to-Ground Accuracy per Pilot'),
             specs=[[{"secondary_y": False}], [{"secondary_y": False}]]
         )
         
-        # Shots, hits, and kills
-        fig.add_trace(go.Bar(
-            x=pilot_names,
-            y=ag_shots,
-            name='A2G Shots',
-            marker_color=colors,
-            opacity=0.5
-        ), row=1, col=1)
-        
-        fig.add_trace(go.Bar(
-            x=pilot_names,
-            y=ag_hits,
-            name='A2G Hits',
-            marker_color=[c.replace('red', 'darkred').replace('blue', 'darkblue') for c in colors],
-            opacity=0.7
-        ), row=1, col=1)
-        
-        fig.add_trace(go.Bar(
-            x=pilot_names,
-            y=ag_kills,
-            name='Ground Kills',
-            marker_color=[c.replace('red', 'firebrick').replace('blue', 'navy') for c in colors]
-        ), row=1, col=1)
-        
-        # Accuracy
-        fig.add_trace(go.Bar(
-            x=pilot_names,
-            y=ag_accuracy,
-            name='A2G Accuracy (%)',
-            marker_color=colors,
-            showlegend=False
-        ), row=2, col=1)
-        
-        fig.update_layout(
-            title="Air-to-Ground Performance by Pilot",
+        traces = [
+            # Shots, hits, and kills
+            {
+                'type': 'bar', **cells[1, 1],
+                'x': pilot_names,
+                'y': ag_shots,
+                'name': 'A2G Shots',
+                'marker': {'color': colors},
+                'opacity': 0.5
+            },
+            {
+                'type': 'bar', **cells[1, 1],
+                'x': pilot_names,
+                'y': ag_hits,
+                'name': 'A2G Hits',
+                'marker': {'color': hit_colors},
+                'opacity': 0.7
+            },
+            {
+                'type': 'bar', **cells[1, 1],
+                'x': pilot_names,
+                'y': ag_kills,
+                'name': 'Ground Kills',
+                'marker': {'color': kill_colors}
+            },
+            # Accuracy
+            {
+                'type': 'bar', **cells[2, 1],
+                'x': pilot_names,
+                'y': ag_accuracy,
+                'name': 'A2G Accuracy (%)',
+                'marker': {'color': colors},
+                'showlegend': False
+            },
+        ]
+        
+        layout.update(
+            title={'text': "Air-to-Ground Performance by Pilot"},
             height=800,
             barmode='group'
         )
         
         # Update axis labels
-        fig.update_xaxes(title_text="Pilot", row=2, col=1)
-        fig.update_yaxes(title_text="Count", row=1, col=1)
-        fig.update_yaxes(title_text="Accuracy (%)", row=2, col=1)
+        _cell_axis(layout, cells[2, 1], 'x')['title'] = {'text': "Pilot"}
+        _cell_axis(layout, cells[1, 1], 'y')['title'] = {'text': "Count"}
+        _cell_axis(layout, cells[2, 1], 'y')['title'] = {'text': "Accuracy (%)"}
         
-        return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+        return _plotly_dumps({'data': traces, 'layout': layout})
     
     def create_ag_group_dashboard(self, data):
         """Create air-to-ground statistics per group"""
@@ -2085,7 +2159,10 @@ class MissionAnalyzer:
                 'total_ground_kills': total_ground_kills,
                 'ag_accuracy': ag_accuracy,
                 'most_ag_active': most_ag_active,
-                'pilot_count': group_data.get('total_pilots', 0)
+                'pilot_count': group_data.get('total_pilots', 0),
+                # Resolve the coalition colors once instead of per subplot
+                'color': COALITION_COLORS.get(coalition, 'blue'),
+                'kill_color': 'firebrick' if coalition == 1 else 'navy'
             }
         
         # Filter groups with A2G activity (shots or ground kills)
@@ -2094,23 +2171,12 @@ class MissionAnalyzer:
         
         if not active_groups:
             # No air-to-ground activity
-            fig = go.Figure()
-            fig.add_annotation(
-                text="No air-to-ground weapon activity detected in any group",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, xanchor='center', yanchor='middle',
-                showarrow=False, font=dict(size=16)
-            )
-            fig.update_layout(
-                title="Air-to-Ground Statistics per Group",
-                xaxis=dict(visible=False),
-                yaxis=dict(visible=False),
-                height=600
-            )
-            return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+            return _no_activity_chart('ag_group_dashboard_empty', "No air-to-ground weapon activity detected in any group",
+                                      "Air-to-Ground Statistics per Group", 600)
         
         # Create comparison dashboard
-        fig = make_subplots(
+        layout, cells = _subplot_spec(
+            'ag_group_dashboard',
             rows=2, cols=2,
             subplot_titles=(
                 'A2G Shots by Group', 'A2G Accuracy by Group',
@@ -2120,93 +2186,102 @@ class MissionAnalyzer:
                    [{"type": "bar"}, {"type": "scatter"}]]
         )
         
-        group_names = list(active_groups.keys())
-        group_labels = [active_groups[gid]['name'] for gid in group_names]
-        coalition_colors = ['red' if active_groups[gid]['coalition'] == 1 else 'blue' 
-                          for gid in group_names]
-        
-        # A2G Shots by group
-        ag_shots = [active_groups[gid]['total_ag_shots'] for gid in group_names]
-        fig.add_trace(go.Bar(
-            x=group_labels,
-            y=ag_shots,
-            marker_color=coalition_colors,
-            name='A2G Shots',
-            showlegend=False
-        ), row=1, col=1)
-        
-        # A2G Accuracy by group
-        ag_accuracy = [active_groups[gid]['ag_accuracy'] for gid in group_names]
-        fig.add_trace(go.Bar(
-            x=group_labels,
-            y=ag_accuracy,
-            marker_color=coalition_colors,
-            name='A2G Accuracy',
-            showlegend=False
-        ), row=1, col=2)
-        
-        # A2G Hits and Ground Kills by group
-        ag_hits = [active_groups[gid]['total_ag_hits'] for gid in group_names]
-        ground_kills = [active_groups[gid]['total_ground_kills'] for gid in group_names]
-        
-        fig.add_trace(go.Bar(
-            x=group_labels,
-            y=ag_hits,
-            name='A2G Hits',
-            marker_color=coalition_colors,
-            opacity=0.7
-        ), row=2, col=1)
-        
-        fig.add_trace(go.Bar(
-            x=group_labels,
-            y=ground_kills,
-            name='Ground Kills',
-            marker_color=[c.replace('red', 'firebrick').replace('blue', 'navy') for c in coalition_colors]
-        ), row=2, col=1)
-        
-        # Group efficiency comparison (A2G shots vs accuracy, with ground kills as marker size)
-        fig.add_trace(go.Scatter(
-            x=ag_shots,
-            y=ag_accuracy,
-            mode='markers+text',
-            text=group_labels,
-            textposition="top center",
-            marker=dict(
-                size=[max(10, gk * 5 + 10) for gk in ground_kills],  # Size based on ground kills
-                color=coalition_colors,
-                opacity=0.7,
-                line=dict(width=1, color='black')
-            ),
-            name='Groups',
-            showlegend=False,
-            hovertemplate='<b>%{text}</b><br>A2G Shots: %{x}<br>A2G Accuracy: %{y:.1f}%<br>Ground Kills: %{marker.size}<extra></extra>',
-            customdata=ground_kills
-        ), row=2, col=2)
+        # Gather every per-group column in a single pass
+        group_labels = []
+        coalition_colors = []
+        kill_colors = []
+        ag_shots = []
+        ag_accuracy = []
+        ag_hits = []
+        ground_kills = []
+        for stats in active_groups.values():
+            group_labels.append(stats['name'])
+            coalition_colors.append(stats['color'])
+            kill_colors.append(stats['kill_color'])
+            ag_shots.append(stats['total_ag_shots'])
+            ag_accuracy.append(stats['ag_accuracy'])
+            ag_hits.append(stats['total_ag_hits'])
+            ground_kills.append(stats['total_ground_kills'])
+        
+        traces = [
+            # A2G Shots by group
+            {
+                'type': 'bar', **cells[1, 1],
+                'x': group_labels,
+                'y': ag_shots,
+                'marker': {'color': coalition_colors},
+                'name': 'A2G Shots',
+                'showlegend': False
+            },
+            # A2G Accuracy by group
+            {
+                'type': 'bar', **cells[1, 2],
+                'x': group_labels,
+                'y': ag_accuracy,
+                'marker': {'color': coalition_colors},
+                'name': 'A2G Accuracy',
+                'showlegend': False
+            },
+            # A2G Hits and Ground Kills by group
+            {
+                'type': 'bar', **cells[2, 1],
+                'x': group_labels,
+                'y': ag_hits,
+                'name': 'A2G Hits',
+                'marker': {'color': coalition_colors},
+                'opacity': 0.7
+            },
+            {
+                'type': 'bar', **cells[2, 1],
+                'x': group_labels,
+                'y': ground_kills,
+                'name': 'Ground Kills',
+                'marker': {'color': kill_colors}
+            },
+            # Group efficiency comparison (A2G shots vs accuracy, with ground kills as marker size)
+            {
+                'type': 'scatter', **cells[2, 2],
+                'x': ag_shots,
+                'y': ag_accuracy,
+                'mode': 'markers+text',
+                'text': group_labels,
+                'textposition': "top center",
+                'marker': {
+                    'size': [max(10, gk * 5 + 10) for gk in ground_kills],  # Size based on ground kills
+                    'color': coalition_colors,
+                    'opacity': 0.7,
+                    'line': {'width': 1, 'color': 'black'}
+                },
+                'name': 'Groups',
+                'showlegend': False,
+                'hovertemplate': '<b>%{text}</b><br>A2G Shots: %{x}<br>A2G Accuracy: %{y:.1f}%<br>Ground Kills: %{marker.size}<extra></extra>',
+                'customdata': ground_kills
+            },
+        ]
         
-        fig.update_layout(
-            title="Air-to-Ground Performance by Group",
+        layout.update(
+            title={'text': "Air-to-Ground Performance by Group"},
             height=800
         )
         
         # Update axis labels
-        fig.update_yaxes(title_text="Shots", row=1, col=1)
-        fig.update_yaxes(title_text="Accuracy (%)", row=1, col=2)
-        fig.update_yaxes(title_text="Count", row=2, col=1)
-        fig.update_xaxes(title_text="A2G Shots", row=2, col=2)
-        fig.update_yaxes(title_text="A2G Accuracy (%)", row=2, col=2)
+        _cell_axis(layout, cells[1, 1], 'y')['title'] = {'text': "Shots"}
+        _cell_axis(layout, cells[1, 2], 'y')['title'] = {'text': "Accuracy (%)"}
+        _cell_axis(layout, cells[2, 1], 'y')['title'] = {'text': "Count"}
+        _cell_axis(layout, cells[2, 2], 'x')['title'] = {'text': "A2G Shots"}
+        _cell_axis(layout, cells[2, 2], 'y')['title'] = {'text': "A2G Accuracy (%)"}
         
         # Add annotation for scatter plot
-        fig.add_annotation(
-            text="Marker size = Ground Kills",
-            xref="x", yref="y",
-            x=0.02, y=0.98,
-            xanchor='left', yanchor='top',
-            showarrow=False,
-            font=dict(size=10, color="gray"),
-            row=2, col=2
-        )
+        layout['annotations'].append({
+            'text': "Marker size = Ground Kills",
+            'xref': cells[2, 2]['xaxis'], 'yref': cells[2, 2]['yaxis'],
+            'x': 0.02, 'y': 0.98,
+            'xanchor': 'left', 'yanchor': 'top',
+            'showarrow': False,
+            'font': {'size': 10, 'color': "gray"}
+        })
         
-        return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+        return _plotly_dumps({'data': traces, 'layout': layout})
 
 def get_past_analyses():
     """Get list of past analyses from the results folder"""
@@ -2224,18 +2299,16 @@ def get_past_analyses():
                 continue
                 
             # Check if session has valid data
-            session_file = os.path.join(session_dir, 'session_data.json')
+            session_file = os.path.join(session_dir, SESSION_FILE)
             mission_stats_file = os.path.join(session_dir, 'mission_stats.json')
             
             if os.path.exists(session_file) and os.path.exists(mission_stats_file):
                 try:
                     # Load session data to get mission metadata
-                    with open(session_file, 'r') as f:
-                        session_data = json.load(f)
+                    session_data = _load_json_file(session_file)
                     
                     # Load mission stats to get summary
-                    with open(mission_stats_file, 'r') as f:
-                        mission_data = json.load(f)
+                    mission_data = _load_json_file(mission_stats_file)
                     
                     # Extract analysis metadata
                     mission_summary = mission_data.get('mission_summary', {})
@@ -2243,13 +2316,22 @@ def get_past_analyses():
                     pilots = mission_data.get('pilots', {})
                     groups = mission_data.get('groups', {})
                     
-                    # Calculate some quick stats
-                    total_kills = sum(p.get('kills', 0) for p in pilots.values())
-                    total_shots = sum(p.get('shots_fired', 0) for p in pilots.values())
-                    active_pilots = len([p for p in pilots.values() if p.get('shots_fired', 0) > 0])
+                    # Calculate some quick stats and the coalitions present in one pass
+                    total_kills = total_shots = active_pilots = 0
+                    has_air_to_ground = has_ground_kills = False
+                    coalitions = set()
+                    for p in pilots.values():
+                        shots_fired = p.get('shots_fired', 0)
+                        total_kills += p.get('kills', 0)
+                        total_shots += shots_fired
+                        if shots_fired > 0:
+                            active_pilots += 1
+                        if p.get('ag_shots_fired', 0) > 0:
+                            has_air_to_ground = True
+                        if p.get('ground_units_killed'):
+                            has_ground_kills = True
+                        coalitions.add(p.get('coalition', 0))
                     
-                    # Determine coalitions present
-                    coalitions = set(p.get('coalition', 0) for p in pilots.values())
                     coalition_names = []
                     if 1 in coalitions:
                         coalition_names.append('Red')
@@ -2299,8 +2381,8 @@ def get_past_analyses():
                         'total_shots': total_shots,
                         'coalitions': coalition_names,
                         'file_size_mb': round((session_file_size + mission_file_size) / (1024 * 1024), 2),
-                        'has_air_to_ground': any(p.get('ag_shots_fired', 0) > 0 for p in pilots.values()),
-                        'has_ground_kills': any(len(p.get('ground_units_killed', [])) > 0 for p in pilots.values()),
+                        'has_air_to_ground': has_air_to_ground,
+                        'has_ground_kills': has_ground_kills,
                         'mission_file_mark': mission_file_mark
                     }
                     
@@ -2351,150 +2433,405 @@ def index():
     past_analyses = get_past_analyses()
     return render_template('index.html', past_analyses=past_analyses)
 
+def _cleanup_temp_files(*paths):
+    """Remove temporary upload files that were not moved into place"""
+    for temp_file in paths:
+        if temp_file and os.path.exists(temp_file):
+            try:
+                os.remove(temp_file)
+                app.logger.debug(f"Cleaned up temp file: {temp_file}")
+            except Exception as e:
+                app.logger.warning(f"Failed to cleanup temp file {temp_file}: {e}")
+
+def _streamed_upload_path(upload_id):
+    """Resolve an id returned by /upload_stream/<kind> to its file in UPLOAD_FOLDER"""
+    if not upload_id:
+        return None
+    filename = secure_filename(upload_id)
+    if not filename.startswith('stream_') or not allowed_file(filename):
+        return None
+    path = os.path.join(UPLOAD_FOLDER, filename)
+    return path if os.path.isfile(path) else None
+
+def _prune_stream_uploads():
+    """Delete streamed upload files older than STREAM_UPLOAD_MAX_AGE"""
+    cutoff = time.time() - STREAM_UPLOAD_MAX_AGE
+    with os.scandir(UPLOAD_FOLDER) as entries:
+        stale = [entry.path for entry in entries
+                 if entry.name.startswith('stream_') and entry.is_file() and entry.stat().st_mtime < cutoff]
+    _cleanup_temp_files(*stale)
+
+ANALYSIS_ERROR_FILE = 'analysis_error.txt'
+# Written with the start time once a queued analysis begins running
+ANALYSIS_STARTED_FILE = 'analysis_started.txt'
+# A queued or running analysis is owned by the process that accepted the upload,
+# which touches this marker every ANALYSIS_HEARTBEAT seconds; a marker left stale
+# for ANALYSIS_ORPHAN_TIMEOUT seconds means that process died and the job is orphaned
+ANALYSIS_OWNER_FILE = 'analysis_owner.txt'
+ANALYSIS_HEARTBEAT = 30
+ANALYSIS_ORPHAN_TIMEOUT = int(os.environ.get('ANALYSIS_ORPHAN_TIMEOUT', 120))
+_owned_jobs = set()
+_owned_jobs_lock = threading.Lock()
+_heartbeat_thread = None
+
+def _heartbeat_owned_jobs():
+    """Keep the owner markers of this process's analyses fresh"""
+    while True:
+        time.sleep(ANALYSIS_HEARTBEAT)
+        with _owned_jobs_lock:
+            session_dirs = list(_owned_jobs)
+        for session_dir in session_dirs:
+            try:
+                os.utime(os.path.join(session_dir, ANALYSIS_OWNER_FILE))
+            except OSError as e:
+                app.logger.warning(f"Failed to refresh analysis owner marker in {session_dir}: {e}")
+
+def _own_job(session_dir):
+    """Mark an analysis as owned by this process until _release_job is called"""
+    global _heartbeat_thread
+    with open(os.path.join(session_dir, ANALYSIS_OWNER_FILE), 'w') as f:
+        f.write(str(os.getpid()))
+    with _owned_jobs_lock:
+        _owned_jobs.add(session_dir)
+        if _heartbeat_thread is None:
+            _heartbeat_thread = threading.Thread(target=_heartbeat_owned_jobs, name='analysis-heartbeat', daemon=True)
+            _heartbeat_thread.start()
+
+def _release_job(session_dir):
+    """Stop refreshing the owner marker of a finished analysis"""
+    with _owned_jobs_lock:
+        _owned_jobs.discard(session_dir)
+
+def _run_analysis_job(mission_id, mission_metadata, dcs_path, debrief_path):
+    """Background job: run the analysis pipeline and persist the session data"""
+    # Progress is tracked on disk so any worker process can report it:
+    # SESSION_FILE marks success, ANALYSIS_ERROR_FILE marks failure
+    analyzer = MissionAnalyzer(mission_id, mission_metadata)
+    try:
+        app.logger.info(f"Starting analysis for mission {mission_id}")
+        with open(os.path.join(analyzer.session_dir, ANALYSIS_STARTED_FILE), 'w') as f:
+            f.write(str(time.time()))
+        success, result = analyzer.process_files(dcs_path, debrief_path)
+        if not success:
+            raise RuntimeError(result)
+        
+        app.logger.info(f"Analysis successful for mission {mission_id}")
+        
+        # Store session data with mission metadata
+        # The mission data already lives in mission_stats.json, and the charts are
+        # built from it when the dashboard first asks for them
+        session_data = {
+            'mission_metadata': mission_metadata,
+            'timestamp': datetime.now().isoformat()
+        }
+        
+        # Written last and atomically: its presence marks the analysis complete
+        _write_atomic(os.path.join(analyzer.session_dir, SESSION_FILE),
+                      orjson.dumps(session_data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
+        
+        app.logger.info(f"Mission {mission_id} analysis completed successfully")
+    except Exception as e:
+        app.logger.error(f"Analysis failed for mission {mission_id}: {str(e)}")
+        try:
+            with open(os.path.join(analyzer.session_dir, ANALYSIS_ERROR_FILE), 'w') as f:
+                f.write(str(e))
+        except OSError as write_error:
+            app.logger.error(f"Could not record the failure of mission {mission_id}: {write_error}")
+    finally:
+        _release_job(analyzer.session_dir)
+
+def _analysis_status(session_id):
+    """Report the state of a mission analysis from the files in its session directory"""
+    session_dir = _session_dir(session_id)
+    if os.path.exists(os.path.join(session_dir, SESSION_FILE)):
+        return {'status': 'complete'}
+    error_file = os.path.join(session_dir, ANALYSIS_ERROR_FILE)
+    if os.path.exists(error_file):
+        with open(error_file, 'r') as f:
+            return {'status': 'failed', 'error': f.read()}
+    if not os.path.isdir(session_dir):
+        return {'status': 'not_found'}
+    try:
+        heartbeat = os.path.getmtime(os.path.join(session_dir, ANALYSIS_OWNER_FILE))
+    except OSError:
+        # Just claimed, or left by an older version: date it from the directory
+        heartbeat = os.path.getmtime(session_dir)
+    if time.time() - heartbeat > ANALYSIS_ORPHAN_TIMEOUT:
+        return {'status': 'failed', 'error': 'Analysis was interrupted; upload the files again to retry'}
+    return {'status': 'processing',
+            'queued': not os.path.exists(os.path.join(session_dir, ANALYSIS_STARTED_FILE))}
+
+def _process_uploaded_logs(temp_dcs_path, temp_debrief_path):
+    """Queue analysis of uploaded logs that are already on disk and redirect to the progress page"""
+    try:
+        # Extract mission metadata from debrief log
+        mission_metadata = extract_mission_metadata(temp_debrief_path)
+        mission_id = mission_metadata['mission_id']
+        app.logger.info(f"Extracted mission ID: {mission_id}")
+        
+        # Failed runs (including orphaned ones) have no live job, so they are moved
+        # aside and retried; renaming first keeps a half-deleted directory out of view
+        existing_session_dir = os.path.join(RESULTS_FOLDER, mission_id)
+        if _analysis_status(mission_id)['status'] == 'failed':
+            stale_dir = f'{existing_session_dir}.{uuid.uuid4().hex}.stale'
+            try:
+                os.rename(existing_session_dir, stale_dir)
+            except OSError:
+                pass
+            shutil.rmtree(stale_dir, ignore_errors=True)
+        
+        # Claim the session directory atomically so concurrent uploads of the
+        # same mission queue only one analysis
+        try:
+            os.mkdir(existing_session_dir)
+        except FileExistsError:
+            # Mission already exists, redirect to existing analysis
+            flash(f'Mission "{mission_metadata["mission_name"]}" has already been analyzed. Showing existing results.')
+            app.logger.info(f"Mission {mission_id} already exists, redirecting to existing analysis")
+            return redirect(url_for('dashboard', session_id=mission_id))
+        
+        # Save files with mission-based naming
+        debrief_path = os.path.join(UPLOAD_FOLDER, f"{mission_id}_debrief.log")
+        
+        dcs_path = None
+        if temp_dcs_path:
+            dcs_path = os.path.join(UPLOAD_FOLDER, f"{mission_id}_dcs.log")
+            shutil.move(temp_dcs_path, dcs_path)
+            app.logger.info(f"Moved DCS file to {dcs_path}")
+        
+        # Move debrief file to final location
+        shutil.move(temp_debrief_path, debrief_path)
+        app.logger.info(f"Moved debrief file to {debrief_path}")
+        
+        # The claimed directory makes status checks report 'processing'; hand the
+        # analysis to the background pool and return immediately
+        _own_job(existing_session_dir)
+        try:
+            _get_analysis_executor().submit(_run_analysis_job, mission_id, mission_metadata, dcs_path, debrief_path)
+        except Exception:
+            _release_job(existing_session_dir)
+            raise
+        app.logger.info(f"Queued analysis for mission {mission_id}")
+        
+        if request.accept_mimetypes.best_match(['text/html', 'application/json']) == 'application/json':
+            return jsonify({
+                'task_id': mission_id,
+                'status_url': url_for('analysis_status', session_id=mission_id)
+            }), 202
+        
+        if dcs_path:
+            flash(f'Analyzing mission: "{mission_metadata["mission_name"]}" (with unit mapping)')
+        else:
+            flash(f'Analyzing mission: "{mission_metadata["mission_name"]}" (debrief.log only)')
+        return redirect(url_for('processing', session_id=mission_id))
+        
+    except Exception as e:
+        app.logger.error(f"Error during file processing: {str(e)}")
+        flash(f'Error processing files: {str(e)}')
+        return redirect(url_for('index'))
+    finally:
+        # Clean up temp files if they still exist
+        _cleanup_temp_files(temp_dcs_path, temp_debrief_path)
+
+def _save_upload(file_storage, path):
+    """Copy an uploaded multipart file to disk in 1 MiB chunks"""
+    with open(path, 'wb', buffering=STREAM_CHUNK_SIZE) as f:
+        shutil.copyfileobj(file_storage.stream, f, length=STREAM_CHUNK_SIZE)
+
 @app.route('/upload', methods=['POST'])
 def upload_files():
     """Handle file uploads with enhanced error handling for production"""
     try:
         app.logger.info(f"Upload request received from {request.remote_addr}")
         
-        # debrief.log is required, dcs.log is optional
-        if 'debrief_log' not in request.files:
-            flash('debrief.log file is required')
-            app.logger.warning("Upload failed: debrief_log not in request")
-            return redirect(request.url)
-        
-        dcs_file = request.files.get('dcs_log')
-        debrief_file = request.files['debrief_log']
-        
-        # Check if debrief.log is provided
-        if debrief_file.filename == '':
-            flash('Please select a debrief.log file')
-            app.logger.warning("Upload failed: empty debrief filename")
-            return redirect(request.url)
-        
-        # Validate debrief.log file
-        if not (debrief_file and allowed_file(debrief_file.filename)):
-            flash('Invalid debrief.log file format. Please upload a .log file.')
-            app.logger.warning(f"Upload failed: invalid debrief file format: {debrief_file.filename}")
-            return redirect(url_for('index'))
+        # Files may arrive as multipart parts or as ids of bodies already
+        # streamed to disk through /upload_stream/<kind>; either may be missing
+        # when one stream failed and the page fell back to multipart for it
+        temp_debrief_path = _streamed_upload_path(request.form.get('debrief_upload_id'))
+        temp_dcs_path = _streamed_upload_path(request.form.get('dcs_upload_id'))
+        
+        def reject(message, target):
+            # Streamed files are only ever used by this request, so drop them
+            _cleanup_temp_files(temp_dcs_path, temp_debrief_path)
+            flash(message)
+            return redirect(target)
+        
+        debrief_file = None
+        if not temp_debrief_path:
+            # debrief.log is required, dcs.log is optional
+            if 'debrief_log' not in request.files:
+                app.logger.warning("Upload failed: debrief_log not in request")
+                return reject('debrief.log file is required', request.url)
+            
+            debrief_file = request.files['debrief_log']
+            
+            # Check if debrief.log is provided
+            if debrief_file.filename == '':
+                app.logger.warning("Upload failed: empty debrief filename")
+                return reject('Please select a debrief.log file', request.url)
+            
+            # Validate debrief.log file
+            if not (debrief_file and allowed_file(debrief_file.filename)):
+                app.logger.warning(f"Upload failed: invalid debrief file format: {debrief_file.filename}")
+                return reject('Invalid debrief.log file format. Please upload a .log file.', url_for('index'))
         
         # Validate dcs.log file if provided
-        dcs_file_valid = True
+        dcs_file = None if temp_dcs_path else request.files.get('dcs_log')
         if dcs_file and dcs_file.filename != '':
             if not allowed_file(dcs_file.filename):
-                flash('Invalid dcs.log file format. Please upload a .log file.')
                 app.logger.warning(f"Upload failed: invalid dcs file format: {dcs_file.filename}")
-                return redirect(url_for('index'))
+                return reject('Invalid dcs.log file format. Please upload a .log file.', url_for('index'))
         else:
-            dcs_file = None  # No dcs.log provided
-        
-        # Save uploaded files temporarily to extract mission metadata
-        temp_dcs_path = None
-        temp_debrief_path = tempfile.mktemp(suffix='.log')
+            dcs_file = None  # No multipart dcs.log provided
         
+        # Save multipart files temporarily to extract mission metadata
         try:
-            # Always save debrief.log
-            debrief_file.save(temp_debrief_path)
-            app.logger.info(f"Saved debrief file to {temp_debrief_path}")
+            if debrief_file:
+                temp_debrief_path = tempfile.mktemp(suffix='.log')
+                _save_upload(debrief_file, temp_debrief_path)
+                app.logger.info(f"Saved debrief file to {temp_debrief_path}")
             
             # Save dcs.log only if provided
             if dcs_file:
                 temp_dcs_path = tempfile.mktemp(suffix='.log')
-                dcs_file.save(temp_dcs_path)
+                _save_upload(dcs_file, temp_dcs_path)
                 app.logger.info(f"Saved DCS file to {temp_dcs_path}")
-            
-            # Extract mission metadata from debrief log
-            mission_metadata = extract_mission_metadata(temp_debrief_path)
-            mission_id = mission_metadata['mission_id']
-            app.logger.info(f"Extracted mission ID: {mission_id}")
-            
-            # Check if this mission has already been analyzed
-            existing_session_dir = os.path.join(RESULTS_FOLDER, mission_id)
-            if os.path.exists(existing_session_dir):
-                # Mission already exists, redirect to existing analysis
-                flash(f'Mission "{mission_metadata["mission_name"]}" has already been analyzed. Showing existing results.')
-                app.logger.info(f"Mission {mission_id} already exists, redirecting to existing analysis")
-                return redirect(url_for('dashboard', session_id=mission_id))
-            
-            # Save files with mission-based naming
-            debrief_filename = secure_filename(debrief_file.filename)
-            debrief_path = os.path.join(UPLOAD_FOLDER, f"{mission_id}_debrief.log")
-            
-            dcs_path = None
-            if dcs_file:
-                dcs_filename = secure_filename(dcs_file.filename)
-                dcs_path = os.path.join(UPLOAD_FOLDER, f"{mission_id}_dcs.log")
-                shutil.move(temp_dcs_path, dcs_path)
-                app.logger.info(f"Moved DCS file to {dcs_path}")
-            
-            # Move debrief file to final location
-            shutil.move(temp_debrief_path, debrief_path)
-            app.logger.info(f"Moved debrief file to {debrief_path}")
-            
-            # Process files with mission-based analyzer
-            analyzer = MissionAnalyzer(mission_id, mission_metadata)
-            app.logger.info(f"Starting analysis for mission {mission_id}")
-            success, result = analyzer.process_files(dcs_path, debrief_path)
-            
-            if success:
-                app.logger.info(f"Analysis successful for mission {mission_id}")
-                # Create visualizations
-                visualizations = analyzer.create_visualizations(result)
-                
-                # Store session data with mission metadata
-                session_data = {
-                    'mission_data': result,
-                    'visualizations': visualizations,
-                    'mission_metadata': mission_metadata,
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                session_file = os.path.join(analyzer.session_dir, 'session_data.json')
-                with open(session_file, 'w') as f:
-                    json.dump(session_data, f)
-                
-                # Create appropriate success message
-                if dcs_file:
-                    flash(f'Successfully analyzed mission: "{mission_metadata["mission_name"]}" (with unit mapping)')
-                else:
-                    flash(f'Successfully analyzed mission: "{mission_metadata["mission_name"]}" (debrief.log only)')
-                
-                app.logger.info(f"Mission {mission_id} analysis completed successfully")
-                return redirect(url_for('dashboard', session_id=mission_id))
-            else:
-                app.logger.error(f"Analysis failed for mission {mission_id}: {result}")
-                flash(f'Processing failed: {result}')
-                return redirect(url_for('index'))
-                
         except Exception as e:
-            app.logger.error(f"Error during file processing: {str(e)}")
-            flash(f'Error processing files: {str(e)}')
-            return redirect(url_for('index'))
-        finally:
-            # Clean up temp files if they still exist
-            for temp_file in [temp_dcs_path, temp_debrief_path]:
-                if temp_file and os.path.exists(temp_file):
-                    try:
-                        os.remove(temp_file)
-                        app.logger.debug(f"Cleaned up temp file: {temp_file}")
-                    except Exception as e:
-                        app.logger.warning(f"Failed to cleanup temp file {temp_file}: {e}")
-                        
+            app.logger.error(f"Error saving uploaded files: {str(e)}")
+            return reject(f'Error processing files: {str(e)}', url_for('index'))
+        
+        return _process_uploaded_logs(temp_dcs_path, temp_debrief_path)
+        
     except Exception as e:
         app.logger.error(f"Unexpected error in upload_files: {str(e)}")
         flash(f'An unexpected error occurred: {str(e)}')
         return redirect(url_for('index'))
 
+@app.route('/upload_stream/<kind>', methods=['POST'])
+def upload_stream(kind):
+    """Write a raw (non-multipart) request body straight to disk in fixed-size chunks"""
+    if kind not in STREAM_UPLOAD_KINDS:
+        return jsonify({'error': 'Invalid upload kind'}), 400
+    
+    filename = request.headers.get('X-Filename', '')
+    if not allowed_file(filename):
+        return jsonify({'error': 'Invalid file format. Please upload a .log file.'}), 400
+    
+    _prune_stream_uploads()
+    temp_file = tempfile.NamedTemporaryFile(
+        mode='wb', buffering=IO_BUFFER_SIZE, delete=False,
+        dir=UPLOAD_FOLDER, prefix=f'stream_{kind}_', suffix='.log'
+    )
+    try:
+        with temp_file:
+            while True:
+                chunk = request.stream.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                temp_file.write(chunk)
+    except Exception as e:
+        _cleanup_temp_files(temp_file.name)
+        app.logger.error(f"Streamed upload of {kind} failed: {str(e)}")
+        return jsonify({'error': str(e)}), 400
+    
+    app.logger.info(f"Streamed {kind} upload to {temp_file.name}")
+    return jsonify({'upload_id': os.path.basename(temp_file.name)})
+
+@app.route('/processing/<session_id>')
+def processing(session_id):
+    """Progress page shown while a mission is analyzed in the background"""
+    if _analysis_status(session_id)['status'] == 'complete':
+        return redirect(url_for('dashboard', session_id=session_id))
+    return render_template('processing.html', session_id=session_id)
+
+@app.route('/status/<session_id>')
+def analysis_status(session_id):
+    """Poll endpoint for background analyses"""
+    status = _analysis_status(session_id)
+    if status['status'] == 'complete':
+        status['dashboard_url'] = url_for('dashboard', session_id=session_id)
+    return jsonify(status), (404 if status['status'] == 'not_found' else 200)
+
+def _session_etag(session_file, templates=()):
+    """Cheap validator that changes whenever the session file or a template rendering it is rewritten"""
+    parts = [session_file]
+    for path in (session_file, *(os.path.join(app.template_folder, name) for name in templates)):
+        st = os.stat(path)
+        parts.append(f"{st.st_mtime_ns}-{st.st_size}")
+    return hashlib.blake2b('|'.join(parts).encode(), digest_size=16).hexdigest()
+
+def _not_modified(etag):
+    """Return a 304 response if the client already holds this version"""
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
+    return None
+
+DASHBOARD_CACHE_SIZE = int(os.environ.get('DASHBOARD_CACHE_SIZE', 8))
+# The dashboard template and the layout it extends; editing either changes the page
+DASHBOARD_TEMPLATES = ('dashboard.html', 'base.html')
+
+@lru_cache(maxsize=DASHBOARD_CACHE_SIZE)
+def _render_dashboard(session_id, etag):
+    """Render a session's flash-free dashboard page once per ETag"""
+    return _dashboard_page(session_id)
+
+# Chart lists shape the dashboard markup, so they are embedded in the page;
+# single figures are fetched by the page when their section is first shown
+EMBEDDED_VISUALIZATIONS = ('pilot_performance', 'group_comparison')
+
+def _script_json(text):
+    """Mark JSON text safe for a <script> element, with the escapes Jinja's tojson applies"""
+    return Markup(text.replace('<', '\\u003c').replace('>', '\\u003e')
+                      .replace('&', '\\u0026').replace("'", '\\u0027'))
+
+def _chart_lists_json(visualizations):
+    """JSON for the embedded chart lists, with each figure inlined as an object"""
+    # The figures are already serialized, so they are spliced in as-is
+    lists = []
+    for name, charts in visualizations.items():
+        items = ','.join(
+            '{"chart":' + chart['chart'] +
+            ''.join(f',{orjson.dumps(key).decode()}:{orjson.dumps(value).decode()}'
+                    for key, value in chart.items() if key != 'chart') + '}'
+            for chart in charts
+        )
+        lists.append(f'{orjson.dumps(name).decode()}:[{items}]')
+    return _script_json('{' + ','.join(lists) + '}')
+
+def _dashboard_page(session_id):
+    """Render a session's dashboard with its embedded chart lists"""
+    visualizations = {name: _session_visualization(session_id, name) for name in EMBEDDED_VISUALIZATIONS}
+    return render_template('dashboard.html', session_data=_load_session(session_id),
+                           visualizations=visualizations, chart_lists_json=_chart_lists_json(visualizations),
+                           session_id=session_id)
+
 @app.route('/dashboard/<session_id>')
 def dashboard(session_id):
+    if _analysis_status(session_id)['status'] == 'processing':
+        return redirect(url_for('processing', session_id=session_id))
     try:
-        session_file = os.path.join(RESULTS_FOLDER, session_id, 'session_data.json')
-        with open(session_file, 'r') as f:
-            session_data = json.load(f)
+        session_file = os.path.join(_session_dir(session_id), SESSION_FILE)
+        
+        # Pages carrying one-off flash messages must not be revalidated from cache
+        etag = None
+        if not session.get('_flashes'):
+            etag = _session_etag(session_file, DASHBOARD_TEMPLATES)
+            cached = _not_modified(etag)
+            if cached:
+                return cached
+        
+        if etag:
+            page = _render_dashboard(session_id, etag)
+        else:
+            page = _dashboard_page(session_id)
         
-        return render_template('dashboard.html', 
-                             session_data=session_data,
-                             session_id=session_id)
+        response = make_response(page)
+        if etag:
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+        return response
     except Exception as e:
         flash(f'Session not found or invalid: {str(e)}')
         return redirect(url_for('index'))
@@ -2502,26 +2839,86 @@ def dashboard(session_id):
 @app.route('/api/mission_data/<session_id>')
 def get_mission_data(session_id):
     try:
-        session_file = os.path.join(RESULTS_FOLDER, session_id, 'session_data.json')
-        with open(session_file, 'r') as f:
-            session_data = json.load(f)
-        return jsonify(session_data['mission_data'])
+        session_dir = _session_dir(session_id)
+        if not os.path.exists(os.path.join(session_dir, SESSION_FILE)):
+            raise FileNotFoundError(f'No completed analysis for session {session_id}')
+        
+        # mission_stats.json holds exactly the session's mission data, so stream the
+        # file as-is instead of decoding and re-encoding it
+        stats_file = os.path.join(session_dir, 'mission_stats.json')
+        # A completed session never changes, so repeat fetches within the window
+        # skip even the conditional round trip
+        response = send_file(stats_file, mimetype='application/json', max_age=API_CACHE_MAX_AGE,
+                             etag=_session_etag(stats_file), conditional=True)
+        response.cache_control.public = False
+        response.cache_control.private = True
+        return response
     except Exception as e:
         return jsonify({'error': str(e)}), 404
 
+@app.route('/api/visualization/<session_id>/<name>')
+@app.route('/api/visualization/<session_id>/<name>/<int:index>')
+def get_visualization(session_id, name, index=None):
+    """Serve one stored Plotly figure as-is; list charts are addressed by index"""
+    try:
+        session_dir = _session_dir(session_id)
+        etag = _session_etag(os.path.join(session_dir, SESSION_FILE))
+        
+        # Whole figures have compressed copies written when they are built; hand the
+        # preferred one over untouched (Flask-Compress leaves responses with a
+        # Content-Encoding alone)
+        for encoding, suffix, _ in PRECOMPRESSED_ENCODINGS if index is None else ():
+            compressed_file = os.path.join(session_dir, _viz_filename(name) + suffix)
+            if not request.accept_encodings[encoding] or not os.path.exists(compressed_file):
+                continue
+            etag += ':' + encoding
+            cached = _not_modified(etag)
+            if cached:
+                return cached
+            # send_file hands the open file to the WSGI server's file wrapper, which
+            # can sendfile() it from the page cache instead of copying it through Python
+            response = send_file(compressed_file, mimetype='application/json', etag=False, conditional=False)
+            response.headers.pop('Content-Disposition', None)
+            response.headers['Content-Encoding'] = encoding
+            response.vary.add('Accept-Encoding')
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        
+        cached = _not_modified(etag)
+        if cached:
+            return cached
+        
+        chart = _session_visualization(session_id, name)
+        if index is not None:
+            if not isinstance(chart, list):
+                return jsonify({'error': f'{name} is a single chart; request it without an index'}), 400
+            chart = chart[index]['chart']
+        if not isinstance(chart, str):
+            return jsonify({'error': f'{name} is a chart list; request an index'}), 400
+        
+        # Figures are stored already serialized, so they go out byte-for-byte
+        response = Response(chart, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    except (OSError, KeyError, IndexError, ValueError) as e:
+        return jsonify({'error': str(e)}), 404
+
 @app.route('/download/<session_id>/<file_type>')
 def download_file(session_id, file_type):
+    if file_type not in DOWNLOAD_FILES:
+        return jsonify({'error': 'Invalid file type'}), 400
+    filename, download_name = DOWNLOAD_FILES[file_type]
     try:
-        session_dir = os.path.join(RESULTS_FOLDER, session_id)
-        
-        if file_type == 'json':
-            file_path = os.path.join(session_dir, 'mission_stats.json')
-            return send_file(file_path, as_attachment=True, download_name=f'mission_stats_{session_id}.json')
-        elif file_type == 'xml':
-            file_path = os.path.join(session_dir, 'unit_group_mapping.xml')
-            return send_file(file_path, as_attachment=True, download_name=f'unit_mapping_{session_id}.xml')
-        else:
-            return jsonify({'error': 'Invalid file type'}), 400
+        # send_from_directory keeps the path inside the results folder; the ETag and
+        # max-age let repeat downloads come from the browser cache or a bodiless 304
+        response = send_from_directory(RESULTS_FOLDER, f'{session_id}/{filename}', as_attachment=True,
+                                       download_name=download_name.format(session_id),
+                                       max_age=DOWNLOAD_CACHE_MAX_AGE)
+        response.cache_control.public = False
+        response.cache_control.private = True
+        return response
     except Exception as e:
         return jsonify({'error': str(e)}), 404
 
@@ -8,8 +8,9 @@ import re
 import xml.etree.ElementTree as ET
 import json
 from collections import defaultdict, Counter
+from contextlib import nullcontext
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Any
+from typing import Dict, List, Optional, Set, Any, TextIO
 import argparse
 from datetime import datetime
 
@@ -182,9 +183,11 @@ class GroupStats:
         return ((self.total_pilots - self.total_deaths) / self.total_pilots) * 100
 
 class DCSMissionAnalyzer:
-    def __init__(self, debrief_log: str = "debrief.log", mapping_xml: str = "unit_group_mapping.xml"):
+    def __init__(self, debrief_log: str = "debrief.log", mapping_xml: str = "unit_group_mapping.xml",
+                 log_stream: Optional[TextIO] = None):
         self.debrief_log = debrief_log
         self.mapping_xml = mapping_xml
+        self.log_stream = log_stream  # Progress messages go here instead of the console when set
         
         # Data structures
         self.pilot_stats: Dict[str, PilotStats] = {}
@@ -259,6 +262,10 @@ class DCSMissionAnalyzer:
             return category in [0, 1]  # Only aircraft and helicopters are pilots
         return False
     
+    def log(self, message: str):
+        """Write an analysis progress message to the log stream, or the console"""
+        print(message, file=self.log_stream)
+    
     def load_unit_mapping(self):
         """Load unit to group mappings from XML file"""
         try:
@@ -305,7 +312,7 @@ class DCSMissionAnalyzer:
                             self.group_stats[group_id].total_pilots += 1
                         
         except Exception as e:
-            print(f"Error loading XML mapping: {e}")
+            self.log(f"Error loading XML mapping: {e}")
     
     def parse_lua_value(self, line: str) -> tuple:
         """Parse a Lua key-value pair from a line"""
@@ -339,7 +346,7 @@ class DCSMissionAnalyzer:
             # Find all event blocks in the events array
             events_match = re.search(r'events\s*=\s*\{(.*?)\}\s*--\s*end\s+of\s+events', content, re.DOTALL)
             if not events_match:
-                print("No events array found in debrief log")
+                self.log("No events array found in debrief log")
                 return
             
             events_content = events_match.group(1)
@@ -348,13 +355,13 @@ class DCSMissionAnalyzer:
             event_blocks = re.findall(r'\[(\d+)\]\s*=\s*\{(.*?)\},?\s*--\s*end\s+of\s+\[\d+\]', events_content, re.DOTALL)
             
             self.total_events = len(event_blocks)
-            print(f"Found {self.total_events} events to process")
+            self.log(f"Found {self.total_events} events to process")
             
             for event_num, event_content in event_blocks:
                 self.process_event(event_content)
                 
         except Exception as e:
-            print(f"Error parsing debrief log: {e}")
+            self.log(f"Error parsing debrief log: {e}")
     
     def process_event(self, event_content: str):
         """Process a single event from the debrief log"""
@@ -768,7 +775,7 @@ class DCSMissionAnalyzer:
             # We already have groups from XML, don't create synthetic ones
             return
         
-        print("Creating synthetic groups for debrief-only analysis...")
+        self.log("Creating synthetic groups for debrief-only analysis...")
         
         # First, try to extract enhanced naming information from world_state
         global_callsign, mission_name, world_state_units = self.extract_world_state_info()
@@ -779,7 +786,7 @@ class DCSMissionAnalyzer:
             return
         
         # Fallback to original synthetic group creation if no world_state info
-        print("No world_state info available, using fallback synthetic group creation...")
+        self.log("No world_state info available, using fallback synthetic group creation...")
         
         # Group pilots by coalition and aircraft type
         coalition_aircraft_groups = {}
@@ -830,7 +837,7 @@ class DCSMissionAnalyzer:
                     self.group_stats[group_id_counter].pilots.append(pilot_name)
                     self.group_stats[group_id_counter].total_pilots += 1
             
-            print(f"Created synthetic group: {group_name} (ID: {group_id_counter}) with {len(pilots)} pilots")
+            self.log(f"Created synthetic group: {group_name} (ID: {group_id_counter}) with {len(pilots)} pilots")
             group_id_counter += 1
 
     def aggregate_group_stats(self):
@@ -907,7 +914,7 @@ class DCSMissionAnalyzer:
         
         # Remove inactive pilots
         for pilot_name in inactive_pilots:
-            print(f"Removing inactive pilot: {pilot_name}")
+            self.log(f"Removing inactive pilot: {pilot_name}")
             del self.pilot_stats[pilot_name]
             
             # Also remove from group pilot lists
@@ -918,25 +925,25 @@ class DCSMissionAnalyzer:
     
     def analyze(self):
         """Run the complete analysis"""
-        print("Starting DCS Mission Analysis...")
-        print("=" * 50)
+        self.log("Starting DCS Mission Analysis...")
+        self.log("=" * 50)
         
         # Load data
-        print("Loading unit mapping...")
+        self.log("Loading unit mapping...")
         self.load_unit_mapping()
         
-        print("Parsing debrief log...")
+        self.log("Parsing debrief log...")
         self.parse_debrief_log()
         
-        print("Cleaning up inactive pilots...")
+        self.log("Cleaning up inactive pilots...")
         self.cleanup_inactive_pilots()
         
-        print("Calculating derived statistics...")
+        self.log("Calculating derived statistics...")
         self.calculate_flight_times()
         self.calculate_advanced_statistics()
         self.aggregate_group_stats()
         
-        print("Analysis complete!")
+        self.log("Analysis complete!")
     
     def print_mission_summary(self):
         """Print overall mission summary"""
@@ -1229,8 +1236,8 @@ class DCSMissionAnalyzer:
         else:
             print("No combat events with timing data available.")
     
-    def export_to_json(self, filename: str = "mission_stats.json"):
-        """Export all statistics to JSON file"""
+    def to_dict(self) -> Dict[str, Any]:
+        """Build the JSON-serializable statistics dictionary"""
         data = {
             'mission_summary': {
                 'duration': self.mission_time_end - self.mission_time_start,
@@ -1307,12 +1314,20 @@ class DCSMissionAnalyzer:
                 'most_ag_active_pilot': group.most_ag_active_pilot
             }
         
+        return data
+    
+    def export_to_json(self, filename: str = "mission_stats.json") -> Dict[str, Any]:
+        """Export all statistics to JSON file and return the exported data"""
+        data = self.to_dict()
+        
         try:
             with open(filename, 'w') as f:
                 json.dump(data, f, indent=2)
-            print(f"\nStatistics exported to: {filename}")
+            self.log(f"\nStatistics exported to: {filename}")
         except Exception as e:
-            print(f"Error exporting to JSON: {e}")
+            self.log(f"Error exporting to JSON: {e}")
+        
+        return data
 
     def extract_world_state_info(self):
         """Extract unit and group information from the world_state section of debrief log"""
@@ -1331,7 +1346,7 @@ class DCSMissionAnalyzer:
             # Extract world_state section
             world_state_match = re.search(r'world_state\s*=\s*\{(.*?)\}\s*--\s*end\s+of\s+world_state', content, re.DOTALL)
             if not world_state_match:
-                print("No world_state section found in debrief log")
+                self.log("No world_state section found in debrief log")
                 return global_callsign, mission_name, {}
             
             world_state_content = world_state_match.group(1)
@@ -1376,15 +1391,15 @@ class DCSMissionAnalyzer:
                         # Only add if this is actually a unit (has unitId)
                         if 'unitId' in unit_data:
                             world_state_units[unit_data['unitId']] = unit_data
-                            print(f"Found unit {unit_data['unitId']}: {unit_data.get('type', 'Unknown')} (coalition: {unit_data.get('coalition', 'unknown')})")
+                            self.log(f"Found unit {unit_data['unitId']}: {unit_data.get('type', 'Unknown')} (coalition: {unit_data.get('coalition', 'unknown')})")
                 else:
                     i += 1
             
-            print(f"Extracted world_state info: {len(world_state_units)} units, global_callsign='{global_callsign}', mission='{mission_name}'")
+            self.log(f"Extracted world_state info: {len(world_state_units)} units, global_callsign='{global_callsign}', mission='{mission_name}'")
             return global_callsign, mission_name, world_state_units
             
         except Exception as e:
-            print(f"Error extracting world_state info: {e}")
+            self.log(f"Error extracting world_state info: {e}")
             return None, "Mission", {}
     
     def create_enhanced_pilot_names(self, global_callsign, mission_name, world_state_units):
@@ -1392,7 +1407,7 @@ class DCSMissionAnalyzer:
         if not world_state_units:
             return  # No world_state info available, use existing logic
         
-        print("Creating enhanced pilot and group names from world_state...")
+        self.log("Creating enhanced pilot and group names from world_state...")
         
         # First, create a mapping from initiatorMissionID to world_state units
         # The initiatorMissionID in events corresponds to unitId in world_state
@@ -1518,7 +1533,7 @@ class DCSMissionAnalyzer:
                         self.group_stats[synthetic_group_id].pilots.append(pilot_name)
                         self.group_stats[synthetic_group_id].total_pilots += 1
                     
-                    print(f"Enhanced pilot: {matching_pilot} -> {pilot_name} (Group: {group_name})")
+                    self.log(f"Enhanced pilot: {matching_pilot} -> {pilot_name} (Group: {group_name})")
             
             synthetic_group_id += 1
         
@@ -1529,7 +1544,7 @@ class DCSMissionAnalyzer:
                 unassigned_pilots.append((pilot_name, pilot))
         
         if unassigned_pilots:
-            print(f"Creating fallback groups for {len(unassigned_pilots)} unassigned pilots...")
+            self.log(f"Creating fallback groups for {len(unassigned_pilots)} unassigned pilots...")
             
             # Group unassigned pilots by coalition and aircraft type
             fallback_groups = {}
@@ -1569,7 +1584,7 @@ class DCSMissionAnalyzer:
                     self.group_stats[synthetic_group_id].pilots.append(pilot_name)
                     self.group_stats[synthetic_group_id].total_pilots += 1
                     
-                    print(f"Assigned fallback pilot: {pilot_name} -> Group: {group_name}")
+                    self.log(f"Assigned fallback pilot: {pilot_name} -> Group: {group_name}")
                 
                 synthetic_group_id += 1
         
@@ -1578,6 +1593,18 @@ class DCSMissionAnalyzer:
             if pilot.killed_by and pilot.killed_by in pilot_name_mapping:
                 pilot.killed_by = pilot_name_mapping[pilot.killed_by]
 
+def analyze_mission(debrief_log: str, mapping_xml: str,
+                    debug_log_path: Optional[str] = None) -> Dict[str, Any]:
+    """Run the full analysis in-process and return the statistics dictionary"""
+    # debug_log_path takes the progress output, otherwise nullcontext() yields None
+    # and it goes to the console
+    log_file = (open(debug_log_path, 'w', encoding='utf-8', buffering=256 * 1024)
+                if debug_log_path else nullcontext())
+    with log_file as log_stream:
+        analyzer = DCSMissionAnalyzer(debrief_log, mapping_xml, log_stream=log_stream)
+        analyzer.analyze()
+        return analyzer.to_dict()
+
 def main():
     """Main function with command line argument handling"""
     parser = argparse.ArgumentParser(description='Analyze DCS World mission statistics')
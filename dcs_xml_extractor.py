@@ -10,17 +10,21 @@ import os
 import sys
 import xml.etree.ElementTree as ET
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple, TextIO
 import argparse
 
 class DCSXMLExtractor:
-    def __init__(self, log_file_path: str = "dcs.log", output_file: str = "unit_group_mapping.xml"):
+    def __init__(self, log_file_path: str = "dcs.log", output_file: str = "unit_group_mapping.xml",
+                 log_stream: Optional[TextIO] = None):
         self.log_file_path = log_file_path
         self.output_file = output_file
         self.start_marker = "=== DCS_MAPPER_XML_START ==="
         self.end_marker = "=== DCS_MAPPER_XML_END ==="
         self.chunk_pattern = r'XML_CHUNK_(\d+)_OF_(\d+): (.*)'
         self.verify_pattern = r'DCS_MAPPER_VERIFY: XML written with (\d+) characters, (\d+) groups, (\d+) units'
+        self.last_error: Optional[str] = None
+        # When set, debug output goes to this stream instead of stdout/stderr
+        self.log_stream = log_stream
         
     def debug_log(self, message: str, level: str = "INFO"):
         """Enhanced debug logging with timestamps."""
@@ -28,7 +32,12 @@ class DCSXMLExtractor:
         log_message = f"[{timestamp}] {level}: {message}"
         
         if level == "ERROR":
-            # Write errors to stderr so they can be captured by subprocess
+            # Remember the error for in-process callers
+            self.last_error = message
+        
+        if self.log_stream is not None:
+            self.log_stream.write(log_message + "\n")
+        elif level == "ERROR":
             print(log_message, file=sys.stderr)
         else:
             print(log_message)
@@ -359,6 +368,24 @@ class DCSXMLExtractor:
         self.debug_log(f"Summary: {valid_count}/{len(xml_blocks)} valid blocks, {chunked_count} chunked")
 
 
+def extract_xml(log_path: str, output_path: str, pretty_print: bool = True,
+                debug_log_path: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+    """Extract the latest XML mapping in-process, returning (success, error_message)"""
+    # With debug_log_path the progress output goes to that file instead of the console
+    try:
+        if debug_log_path:
+            with open(debug_log_path, 'w', encoding='utf-8', buffering=256 * 1024) as log_stream:
+                extractor = DCSXMLExtractor(log_path, output_path, log_stream=log_stream)
+                success = extractor.extract_and_save(pretty_print=pretty_print)
+        else:
+            extractor = DCSXMLExtractor(log_path, output_path)
+            success = extractor.extract_and_save(pretty_print=pretty_print)
+    except Exception as e:
+        return False, str(e)
+    if not success:
+        return False, extractor.last_error or "No XML data could be extracted"
+    return True, None
+
 def main():
     """Main function with command line argument handling."""
     parser = argparse.ArgumentParser(description='Extract XML mapping data from DCS log file')
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the helpers the chart builders share
+"""
+
+import pandas as pd
+from app import PerfCfg, classify_weapons, downsample
+
+def test_classify_weapons():
+    """Test weapon categories, including pattern order and letter case"""
+    print("Testing weapon classification...")
+
+    weapons = pd.Index(['AIM-120C', 'R-27ER missile', 'PGU-28', 'M61 Gun', 'GSh-30 Cannon',
+                        'AGM-65D', 'Mk-82 bomb', 'agm-65', 'Kh-29L', 'aim-9 cannon'])
+    categories = classify_weapons(weapons).tolist()
+
+    assert categories == [
+        'Air-to-Air Missile', 'Air-to-Air Missile',
+        'Gun/Cannon', 'Gun/Cannon', 'Gun/Cannon',
+        'Air-to-Ground', 'Air-to-Ground',
+        # Designators are case-sensitive, descriptive words are not
+        'Other', 'Other', 'Gun/Cannon',
+    ]
+
+    print("✓ Weapon classification correct")
+
+def test_classify_weapons_first_pattern_wins():
+    """Test that a name matching several categories takes the first one"""
+    print("\nTesting classification precedence...")
+
+    categories = classify_weapons(pd.Index(['AIM gun pod', 'PGU bomb', 'AGM missile'])).tolist()
+
+    assert categories == ['Air-to-Air Missile', 'Gun/Cannon', 'Air-to-Air Missile']
+
+    print("✓ Classification precedence correct")
+
+def test_downsample_keeps_top_k_in_order():
+    """Test that downsampling keeps the largest items in their input order"""
+    print("\nTesting top-k downsampling...")
+
+    shots = {'a': 5, 'b': 1, 'c': 9, 'd': 3, 'e': 7}
+    kept = downsample(shots, key=shots.get, cfg=PerfCfg(max_points_per_plot=3))
+
+    assert kept == ['a', 'c', 'e']
+    # An explicit limit overrides the configured one
+    assert downsample(shots, key=shots.get, cfg=PerfCfg(), limit=2) == ['c', 'e']
+
+    print("✓ Top-k downsampling correct")
+
+def test_downsample_ties_keep_earlier_items():
+    """Test that equal keys at the cut-off keep the items seen first"""
+    print("\nTesting downsampling ties...")
+
+    shots = {'a': 1, 'b': 2, 'c': 2, 'd': 2}
+    kept = downsample(shots, key=shots.get, cfg=PerfCfg(max_points_per_plot=2))
+
+    assert kept == ['b', 'c']
+
+    print("✓ Downsampling ties stable")
+
+def test_downsample_passthrough():
+    """Test that short inputs and disabled downsampling keep every item"""
+    print("\nTesting downsampling passthrough...")
+
+    items = ['a', 'b', 'c']
+    assert downsample(iter(items), key=len, cfg=PerfCfg(max_points_per_plot=3)) == items
+    assert downsample(items, key=len, cfg=PerfCfg(max_points_per_plot=1, enable_downsampling=False)) == items
+
+    try:
+        downsample(items, key=len, cfg=PerfCfg(max_points_per_plot=1, strategy='random'))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unknown strategy should raise ValueError")
+
+    print("✓ Downsampling passthrough correct")
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("CHART HELPER TESTS")
+    print("=" * 60)
+
+    test_classify_weapons()
+    test_classify_weapons_first_pattern_wins()
+    test_downsample_keeps_top_k_in_order()
+    test_downsample_ties_keep_earlier_items()
+    test_downsample_passthrough()
+
+    print("\n" + "=" * 60)
+    print("ALL TESTS PASSED! ✓")
+    print("=" * 60)
+
+if __name__ == '__main__':
+    main()
@@ -9,7 +9,7 @@ def test_dependencies():
     
     # Test basic Python modules
     required_modules = [
-        'os', 'json', 'subprocess', 'tempfile', 'shutil', 'uuid', 
+        'os', 'json', 'tempfile', 'shutil', 'uuid', 
         'hashlib', 're', 'datetime', 'math', 'random'
     ]
     
@@ -38,6 +38,20 @@ def test_dependencies():
     except ImportError as e:
         print(f"✗ plotly - {e}")
     
+    # Test orjson (Plotly's JSON engine for chart serialization)
+    try:
+        import orjson
+        print("✓ orjson")
+    except ImportError as e:
+        print(f"✗ orjson - {e}")
+    
+    # Test brotli (precompressed chart copies)
+    try:
+        import brotli
+        print("✓ brotli")
+    except ImportError as e:
+        print(f"✗ brotli - {e}")
+    
     # Test pandas (if used)
     try:
         import pandas as pd
@@ -63,13 +77,14 @@ def test_dependencies():
         else:
             print(f"✗ {dir_name}/ directory missing")
     
-    # Test core analysis scripts
-    analysis_scripts = ['dcs_xml_extractor.py', 'dcs_mission_analyzer.py']
-    for script in analysis_scripts:
-        if os.path.exists(script):
-            print(f"✓ {script} exists")
-        else:
-            print(f"✗ {script} missing")
+    # Test core analysis modules (the app calls them in-process, not as scripts)
+    analysis_entry_points = [('dcs_xml_extractor', 'extract_xml'), ('dcs_mission_analyzer', 'analyze_mission')]
+    for module, entry_point in analysis_entry_points:
+        try:
+            getattr(__import__(module), entry_point)
+            print(f"✓ {module}.{entry_point}")
+        except (ImportError, AttributeError) as e:
+            print(f"✗ {module}.{entry_point} - {e}")
     
     print("\n" + "=" * 50)
     
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the chunked debrief header scan behind mission metadata extraction
+"""
+
+import os
+import tempfile
+from app import extract_mission_metadata, METADATA_SCAN_CHUNK
+
+MISSION_PATH_LINE = b'mission_file_path\t=\t"C:\\\\Missions\\\\boundary-test.miz"\n'
+MISSION_MARK_LINE = b'mission_file_mark\t=\t1748787579\n'
+
+def padding_to(offset, current):
+    """Filler lines that bring a header of length current up to offset bytes"""
+    filler = b'-- ' + b'x' * 60 + b'\n'
+    lines = b''
+    while current + len(lines) + len(filler) <= offset:
+        lines += filler
+    return lines + b' ' * (offset - current - len(lines))
+
+def metadata_for(content):
+    """Write content to a temporary debrief log and extract its metadata"""
+    with tempfile.NamedTemporaryFile(suffix='.log', delete=False) as temp_file:
+        temp_file.write(content)
+        temp_file_path = temp_file.name
+    try:
+        return extract_mission_metadata(temp_file_path)
+    finally:
+        os.unlink(temp_file_path)
+
+def test_field_straddling_chunk_boundary():
+    """Test a header line that starts in the first chunk and ends in the second"""
+    print("Testing header field across the chunk boundary...")
+
+    head = MISSION_MARK_LINE + b'mission_time\t=\t1429.994\n'
+    # Put the boundary in the middle of the mission path's quoted value
+    split_at = METADATA_SCAN_CHUNK - MISSION_PATH_LINE.index(b'boundary')
+    content = head + padding_to(split_at, len(head)) + MISSION_PATH_LINE
+
+    metadata = metadata_for(content)
+
+    assert metadata['mission_name'] == 'boundary-test'
+    assert metadata['mission_file_mark'] == 1748787579
+    assert metadata['mission_time'] == 1429.994
+
+    print("✓ Field across the boundary found")
+
+def test_number_cut_at_chunk_end():
+    """Test a number whose digits are split between two chunks"""
+    print("\nTesting number cut at the chunk end...")
+
+    head = MISSION_PATH_LINE + MISSION_MARK_LINE
+    time_line = b'mission_time\t=\t1429.994\n'
+    # The first chunk ends right after "1429", so a greedy match there would be wrong
+    split_at = METADATA_SCAN_CHUNK - time_line.index(b'.994')
+    content = head + padding_to(split_at, len(head)) + time_line
+
+    metadata = metadata_for(content)
+
+    assert metadata['mission_time'] == 1429.994
+    assert metadata['mission_id'].startswith('boundary-test_1748787579_1429_')
+
+    print("✓ Split number read in full")
+
+def test_missing_field():
+    """Test that a field absent from the whole log falls back to its default"""
+    print("\nTesting missing header field...")
+
+    head = MISSION_PATH_LINE + b'mission_time\t=\t12.5\n'
+    # Longer than one chunk, so the scan has to read to the end of the file
+    content = head + padding_to(3 * METADATA_SCAN_CHUNK, len(head))
+
+    metadata = metadata_for(content)
+
+    assert metadata['mission_name'] == 'boundary-test'
+    assert metadata['mission_file_mark'] == 0
+    assert metadata['mission_time'] == 12.5
+
+    print("✓ Missing field defaulted")
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("MISSION METADATA SCAN TESTS")
+    print("=" * 60)
+
+    test_field_straddling_chunk_boundary()
+    test_number_cut_at_chunk_end()
+    test_missing_field()
+
+    print("\n" + "=" * 60)
+    print("ALL TESTS PASSED! ✓")
+    print("=" * 60)
+
+if __name__ == '__main__':
+    main()